@@ -4,26 +4,43 @@ Company URL Finder for Job Board Scraper
 
 This script discovers companies using various job boards by:
 1. Scanning the Greenhouse and Lever job board directories
-2. Searching for job board patterns across the web
-3. Using an extensive list of known companies to check if they use Greenhouse or Lever
-4. Recursive discovery of related companies
-5. Industry-specific targeted searches
-6. Storing results in the database for the job scraper to use
+2. Using an extensive list of known companies to check the Greenhouse board API and Lever
+3. Recursive discovery of related companies
+4. Storing results in the database for the job scraper to use
+
+Web searches (--search) and industry-specific searches (--industry) scrape
+Google result pages, so they are only run when asked for explicitly.
 
 Usage:
     python find_companies.py [--all] [--greenhouse] [--lever] [--search] [--recursive] [--industry]
 """
 
 import requests
-import psycopg2
+import requests_cache
+import aiohttp
+import asyncio
+import string
 import os
-import time
-import random
+import threading
 import logging
 import argparse
+import json
+import hashlib
+import io
+import itertools
 import re
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, urljoin
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+from aiolimiter import AsyncLimiter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from lxml import etree
+from psycopg2 import DatabaseError, InterfaceError, OperationalError
+from psycopg2.pool import ThreadedConnectionPool
+from requests_cache import DO_NOT_CACHE
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urljoin
 from dotenv import load_dotenv
 
 # Setup logging
@@ -33,6 +50,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# selectolax pulls links out of a page far faster than BeautifulSoup; fall back if it's missing
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    logger.warning("selectolax not available - falling back to lxml for link extraction")
+    SELECTOLAX_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
@@ -51,9 +76,63 @@ USER_AGENTS = [
     "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:99.0) Gecko/20100101 Firefox/99.0"
 ]
 
+# Request headers are built once and rotated, rather than rebuilt for every request
+_HEADER_POOL = tuple(
+    {'User-Agent': user_agent, 'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'}
+    for user_agent in USER_AGENTS
+)
+_HEADER_ITER = itertools.cycle(_HEADER_POOL)
+
+# Cap on concurrent requests against a single job board host
+MAX_CONCURRENT_REQUESTS = 5
+# Hard ceiling on open connections per host, whatever a scan's own concurrency
+MAX_CONNECTIONS_PER_HOST = 8
+# Search pages in flight at once; the search engine's own rate limit still applies on top
+SEARCH_CONCURRENCY = 4
+# Workers crawling pages during recursive discovery
+DISCOVERY_WORKERS = 8
+# Lever probes are body-less HEAD requests, so many more can be in flight at once
+LEVER_PROBE_CONCURRENCY = 64
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+# Directory pages and search results change slowly, so repeat runs are served from disk
+HTTP_CACHE_EXPIRE_AFTER = timedelta(days=7)
+HTTP_CACHE_NAME = "company_finder_cache"
+ASYNC_HTTP_CACHE_NAME = "company_finder_async_cache"
+
+# Politeness budget per host as (requests, per seconds); hosts are throttled independently of each other
+HOST_RATE_LIMITS = {
+    'boards.greenhouse.io': (2, 1),
+    'boards-api.greenhouse.io': (10, 1),
+    'jobs.lever.co': (4, 1),
+    'www.google.com': (1, 2),
+}
+
+# Buffered company rows are written once this many are waiting, and at the end of each phase
+PENDING_FLUSH_SIZE = 1000
+
+# Rate limits and transient server errors are retried with exponential backoff (1, 2, 4, ... 32s)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 6
+
+# Shared by every page parsed in a process; no_network stops it fetching DTDs or entities
+HTML_PARSER = etree.HTMLParser(recover=True, no_network=True)
+# Search result blocks carry the "g" class, possibly alongside others
+SEARCH_RESULT_XPATH = etree.XPath("//*[contains(concat(' ', normalize-space(@class), ' '), ' g ')]")
+
+# Public Greenhouse job board API; answers 404 for slugs without a board
+GREENHOUSE_BOARD_API = "https://boards-api.greenhouse.io/v1/boards/{slug}"
+
+# Matches a link to any supported job board, capturing the host and the company slug
+_BOARD_RE = re.compile(r'(boards\.greenhouse\.io|jobs\.lever\.co)/([^/?#&]+)')
+BOARD_TYPES = {
+    'boards.greenhouse.io': 'greenhouse',
+    'jobs.lever.co': 'lever',
+}
+
 # Extended list of tech companies to check for job boards
 # List expanded to include many more companies across tech, fintech, healthtech, etc.
-TOP_TECH_COMPANIES = [
+_RAW_TOP_TECH_COMPANIES = [
     # Original list
     "Netflix", "Spotify", "Airbnb", "DoorDash", "Stripe", "Uber", "Lyft", "Slack",
     "Pinterest", "Shopify", "Dropbox", "Twitter", "Square", "Zoom", "Coinbase",
@@ -119,7 +198,7 @@ TOP_TECH_COMPANIES = [
 ]
 
 # Industry-specific search patterns (company name formats)
-INDUSTRY_PATTERNS = {
+_RAW_INDUSTRY_PATTERNS = {
     'tech': [
         "tech", "software", "technology", "digital", "cloud", "data", "AI", "ML",
         "artificial intelligence", "machine learning", "dev", "development",
@@ -155,6 +234,123 @@ INDUSTRY_PATTERNS = {
     ]
 }
 
+# The lists above repeat some entries; drop case-insensitive duplicates once at import
+TOP_TECH_COMPANIES = tuple({company.lower(): company for company in _RAW_TOP_TECH_COMPANIES}.values())
+INDUSTRY_PATTERNS = {
+    industry: tuple({keyword.lower(): keyword for keyword in keywords}.values())
+    for industry, keywords in _RAW_INDUSTRY_PATTERNS.items()
+}
+
+# General web searches for boards on each platform, run by --search
+GREENHOUSE_SEARCH_TERMS = (
+    "site:boards.greenhouse.io careers",
+    "powered by greenhouse",
+    "greenhouse ats jobs",
+)
+LEVER_SEARCH_TERMS = (
+    "site:jobs.lever.co careers",
+    "powered by lever",
+    "lever ats jobs",
+)
+
+
+def _slugs(name):
+    """Candidate board slugs for a company name, most likely first and without duplicates"""
+    base = name.lower().strip()
+    return tuple(dict.fromkeys((
+        base.replace(" ", ""),  # nospaceslowercase
+        base.replace(" ", "-"),  # hyphenated-lowercase
+        base,  # lowercase with spaces
+    )))
+
+
+# Slug variations for every known company, worked out once rather than on every probe
+COMPANY_SLUGS = {company: _slugs(company) for company in TOP_TECH_COMPANIES}
+
+def url_key(url):
+    """Return a fixed-size 16-byte digest of a URL, used as its key in the seen-set"""
+    return hashlib.blake2b(url.encode(), digest_size=16).digest()
+
+
+def _copy_field(value):
+    """Escape a value for a tab-separated COPY ... FROM STDIN text stream"""
+    if value is None:
+        return "\\N"
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _parse_html(html):
+    """Parse a page with lxml, returning None for pages with no root element"""
+    if not html:
+        return None
+    return etree.fromstring(html.encode() if isinstance(html, str) else html, HTML_PARSER)
+
+
+def iter_page_hrefs(html):
+    """Yield the href of every link on a page"""
+    if SELECTOLAX_AVAILABLE:
+        for node in LexborHTMLParser(html).css('a[href]'):
+            yield node.attributes.get('href')
+    else:
+        root = _parse_html(html)
+        if root is not None:
+            yield from root.xpath('//a/@href')
+
+
+def parse_search_results(html, board_type):
+    """
+    Pull {job_board_url: company_name} candidates out of a search results page.
+    Kept at module level so it can run in a worker process.
+    """
+    candidates = {}
+    root = _parse_html(html)
+    if root is None:
+        return candidates
+    
+    for result in SEARCH_RESULT_XPATH(root):
+        links = result.xpath('(.//a)[1]/@href')
+        link = links[0] if links else None
+        if not link:
+            continue
+        
+        # Extract the company slug if this is a job board URL of the type searched for
+        match = _BOARD_RE.search(link)
+        if not match or BOARD_TYPES[match.group(1)] != board_type:
+            continue
+        job_board_url = f"https://{match.group(1)}/{match.group(2)}"
+        
+        # Extract company name from title
+        titles = result.xpath('.//h3')
+        company_name = "".join(titles[0].itertext()) if titles else "Unknown"
+        
+        candidates.setdefault(job_board_url, company_name)
+    
+    return candidates
+
+
+def iter_company_links(html):
+    """
+    Stream (company_name, href) pairs out of a Greenhouse directory page.
+    Anchors are cleared as soon as they are read, so memory stays flat however long the listing is.
+    """
+    if not html:
+        return
+    
+    for _, element in etree.iterparse(io.BytesIO(html), events=("end",), tag="a", html=True):
+        href = element.get("href")
+        if href and any(
+            "company-list" in (parent.get("class") or "").split()
+            for parent in element.iterancestors()
+        ):
+            yield "".join(element.itertext()).strip(), href
+        element.clear()
+
+
 class CompanyURLFinder:
     def __init__(self):
         # Database connection details
@@ -163,24 +359,72 @@ class CompanyURLFinder:
         self.pg_password = os.environ.get("PG_PASSWORD")
         self.pg_database = os.environ.get("PG_DATABASE")
         
-        # Setup connection
-        self.conn = psycopg2.connect(
+        # Setup connection pool, sized so the database never throttles the concurrent scans
+        self.pool = ThreadedConnectionPool(
+            minconn=2,
+            maxconn=2 * MAX_CONCURRENT_REQUESTS,
             host=self.pg_host,
             user=self.pg_user,
             password=self.pg_password,
             dbname=self.pg_database
         )
         
-        # Tracking for already checked URLs and companies to avoid duplicates
+        # Cached, keep-alive HTTP session shared by every synchronous request
+        self.session = requests_cache.CachedSession(
+            HTTP_CACHE_NAME,
+            backend='sqlite',
+            expire_after=HTTP_CACHE_EXPIRE_AFTER
+        )
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=1,
+            status_forcelist=RETRY_STATUSES,
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Per-host request rate limits for the async scans
+        self._limiters = {
+            host: AsyncLimiter(max_rate, time_period)
+            for host, (max_rate, time_period) in HOST_RATE_LIMITS.items()
+        }
+        
+        # Verified companies waiting to be written, flushed in batches
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        
+        # Tracking for already checked URLs and companies to avoid duplicates;
+        # URLs are kept as their url_key digest, which is far smaller than the string itself
+        # and, unlike hash(), the same in every process
         self.checked_urls = set()
         self.checked_companies = set()
         
         # Initialize database tables if needed
         self.init_database()
         
+        # Digests of URLs already stored, so repeat sightings never cost a database round-trip
+        self._seen_urls = self._load_known_companies()
+        
+    @contextmanager
+    def _conn(self):
+        """Check a connection out of the pool, committing on success and rolling back on error"""
+        conn = self.pool.getconn()
+        # Everything run inside one checkout shares a single transaction and a single commit
+        conn.autocommit = False
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.pool.putconn(conn)
+        
     def init_database(self):
         """Initialize the database schema if it doesn't exist"""
-        with self.conn.cursor() as cursor:
+        with self._conn() as conn, conn.cursor() as cursor:
             # Create company_urls table if it doesn't exist
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS company_urls (
@@ -193,269 +437,544 @@ class CompanyURLFinder:
             );
             """)
             
-            # Add UNIQUE constraint if it doesn't exist
+            # Unique index on url backs the ON CONFLICT (url) upserts
             cursor.execute("""
-            DO $$
-            BEGIN
-                -- Check if constraint exists
-                IF NOT EXISTS (
-                    SELECT 1 
-                    FROM pg_constraint 
-                    WHERE conname = 'company_urls_url_key'
-                ) THEN
-                    -- Add unique constraint if it doesn't exist
-                    ALTER TABLE company_urls ADD CONSTRAINT company_urls_url_key UNIQUE (url);
-                END IF;
-            END $$;
+            CREATE UNIQUE INDEX IF NOT EXISTS company_urls_url_key ON company_urls(url);
             """)
             
-            self.conn.commit()
-            logger.info("Database initialized")
+        logger.info("Database initialized")
 
-    def get_random_user_agent(self):
-        """Return a random user agent from the list"""
-        return random.choice(USER_AGENTS)
+    def _seen(self, url):
+        """Return whether a URL has already been checked this run"""
+        return url_key(url) in self.checked_urls
+    
+    def _mark(self, url):
+        """Record a URL as checked"""
+        self.checked_urls.add(url_key(url))
+    
+    def _load_known_companies(self):
+        """
+        Read every stored company into the in-memory dedup sets:
+        URL digests into the seen-set, lowercased names into checked_companies
+        """
+        # COPY hands back raw lines, avoiding a Python tuple per row from fetchall
+        buf = io.BytesIO()
+        with self._conn() as conn, conn.cursor() as cursor:
+            cursor.copy_expert("COPY (SELECT url, lower(company_name) FROM company_urls) TO STDOUT", buf)
+        
+        seen_urls = set()
+        # COPY text format escapes \n and \r but not the other separators splitlines() breaks on;
+        # split on \n alone, and skip the empty string after the final newline
+        for line in buf.getvalue().decode().split('\n'):
+            if not line:
+                continue
+            url, company_name = line.split('\t', 1)
+            seen_urls.add(url_key(url))
+            if company_name != '\\N':
+                self.checked_companies.add(company_name)
+        
+        logger.info(f"Loaded {len(seen_urls)} known company URLs")
+        return seen_urls
+    
+    def _client_session(self):
+        """Create the cached aiohttp session used by the concurrent scans"""
+        return CachedSession(
+            cache=SQLiteBackend(ASYNC_HTTP_CACHE_NAME, expire_after=HTTP_CACHE_EXPIRE_AFTER),
+            connector=aiohttp.TCPConnector(limit_per_host=MAX_CONNECTIONS_PER_HOST),
+            timeout=REQUEST_TIMEOUT
+        )
+    
+    async def _fetch(self, session, url, method="GET"):
+        """
+        Request a URL, retrying rate limits and server errors with exponential backoff.
+        Returns a (status, body, from_cache) tuple; body is raw bytes, or None for HEAD requests.
+        """
+        limiter = self._limiters.get(url.split('/', 3)[2])
+        
+        for attempt in range(MAX_RETRIES + 1):
+            # Politeness is per host, and only owed when the request actually leaves the cache
+            if limiter is not None and not await session.cache.has_url(url, method=method):
+                await limiter.acquire()
+            
+            headers = next(_HEADER_ITER)
+            async with session.request(method, url, headers=headers) as response:
+                if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    body = await response.read() if method == "GET" else None
+                    return response.status, body, getattr(response, 'from_cache', False)
+                
+                # Honour Retry-After when the server gives it in seconds
+                retry_after = response.headers.get('Retry-After', '')
+                delay = int(retry_after) if retry_after.isdigit() else 2 ** attempt
+            
+            logger.warning(f"Got status {response.status} for {url}, retrying in {delay}s")
+            await asyncio.sleep(delay)
     
-    def scan_greenhouse_directory(self):
+    async def scan_greenhouse_directory(self):
         """Scan Greenhouse boards page for company listings"""
         
         logger.info("Scanning Greenhouse directory...")
         companies_found = 0
+        sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
         
-        # Simulate browsing through alphabet pages
-        for letter in "abcdefghijklmnopqrstuvwxyz":
-            url = f"https://boards.greenhouse.io/companies?starts_with={letter}"
-            
-            try:
-                headers = {'User-Agent': self.get_random_user_agent()}
-                response = requests.get(url, headers=headers, timeout=30)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    company_links = soup.select('.company-list a')
+        async with self._client_session() as session:
+            async def fetch_letter(letter, sem):
+                url = f"https://boards.greenhouse.io/companies?starts_with={letter}"
+                async with sem:
+                    try:
+                        status, html, _ = await self._fetch(session, url)
+                    except Exception as e:
+                        logger.error(f"Error scanning Greenhouse directory for letter '{letter}': {str(e)}")
+                        return letter, None
                     
-                    for link in company_links:
-                        company_name = link.text.strip()
-                        greenhouse_url = f"https://boards.greenhouse.io/{link['href'].split('/')[-1]}"
-                        
-                        # Track this URL and company as checked
-                        self.checked_urls.add(greenhouse_url)
-                        self.checked_companies.add(company_name.lower())
-                        
-                        # Insert into database
-                        self.add_company(company_name, greenhouse_url, "greenhouse")
-                        companies_found += 1
-                        
-                    logger.info(f"Processed Greenhouse companies starting with '{letter}': Found {len(company_links)} companies")
+                    if status != 200:
+                        logger.warning(f"Failed to get Greenhouse companies for letter '{letter}'. Status code: {status}")
+                        return letter, None
                     
-                    # Be nice to Greenhouse servers
-                    time.sleep(random.uniform(1, 3))
-                else:
-                    logger.warning(f"Failed to get Greenhouse companies for letter '{letter}'. Status code: {response.status_code}")
+                    return letter, html
             
-            except Exception as e:
-                logger.error(f"Error scanning Greenhouse directory for letter '{letter}': {str(e)}")
+            # Simulate browsing through alphabet pages, a few letters at a time
+            results = await asyncio.gather(
+                *[fetch_letter(letter, sem) for letter in string.ascii_lowercase]
+            )
+        
+        for letter, html in results:
+            if html is None:
+                continue
+            
+            rows_greenhouse = []
+            
+            for company_name, href in iter_company_links(html):
+                greenhouse_url = f"https://boards.greenhouse.io/{href.split('/')[-1]}"
+                
+                # Track this URL and company as checked
+                self._mark(greenhouse_url)
+                self.checked_companies.add(company_name.lower())
+                
+                rows_greenhouse.append((greenhouse_url, company_name))
+            
+            companies_found += self.queue_companies(rows_greenhouse)
+                
+            logger.info(f"Processed Greenhouse companies starting with '{letter}': Found {len(rows_greenhouse)} companies")
         
+        self.flush_companies()
         logger.info(f"Completed Greenhouse directory scan. Found {companies_found} companies.")
         return companies_found
     
-    def scan_lever_companies(self):
+    async def scan_lever_companies(self):
         """Attempt to discover Lever job boards by checking top companies and from search"""
         
         logger.info("Discovering Lever job boards...")
         companies_found = 0
+        sem = asyncio.Semaphore(LEVER_PROBE_CONCURRENCY)
         
-        # Check top tech companies for Lever job boards
-        for company in TOP_TECH_COMPANIES:
-            # Skip if we've already checked this company
-            if company.lower() in self.checked_companies:
-                continue
-                
-            # Add variations of company name to check
-            company_variations = [
-                company.lower().replace(" ", ""),  # nospaceslowercase
-                company.lower().replace(" ", "-"),  # hyphenated-lowercase
-                company.lower(),  # lowercase with spaces
-            ]
+        async with self._client_session() as session:
+            async def probe_slug(company, lever_url, sem):
+                async with sem:
+                    try:
+                        # Only the status matters, so skip transferring the board page
+                        status, _, _ = await self._fetch(session, lever_url, method="HEAD")
+                        if status == 405:
+                            # HEAD not allowed here, fall back to a full GET
+                            status, _, _ = await self._fetch(session, lever_url)
+                    except Exception as e:
+                        logger.error(f"Error checking Lever job board for {company}: {str(e)}")
+                        return None
+                    
+                    if status in (200, 301, 302):
+                        return company, lever_url
+                return None
             
-            for company_slug in company_variations:
-                lever_url = f"https://jobs.lever.co/{company_slug}"
-                
-                # Skip if already checked this URL
-                if lever_url in self.checked_urls:
-                    continue
+            async def probe_company(company, sem):
+                lever_urls = []
+                for company_slug in COMPANY_SLUGS[company]:
+                    lever_url = f"https://jobs.lever.co/{company_slug}"
+                    
+                    # Skip if already checked this URL
+                    if self._seen(lever_url):
+                        continue
                     
-                self.checked_urls.add(lever_url)
+                    self._mark(lever_url)
+                    lever_urls.append(lever_url)
                 
+                # Probe all variations at once and keep the first hit
+                tasks = [asyncio.ensure_future(probe_slug(company, lever_url, sem)) for lever_url in lever_urls]
                 try:
-                    headers = {'User-Agent': self.get_random_user_agent()}
-                    response = requests.get(lever_url, headers=headers, timeout=30)
+                    for next_done in asyncio.as_completed(tasks):
+                        result = await next_done
+                        if result is not None:
+                            return result  # No need to wait for the other variations
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                
+                return None
+            
+            # Check top tech companies for Lever job boards, skipping those we've already checked
+            results = await asyncio.gather(
+                *[
+                    probe_company(company, sem)
+                    for company in TOP_TECH_COMPANIES
+                    if company.lower() not in self.checked_companies
+                ]
+            )
+        
+        rows_lever = []
+        for result in results:
+            if result is None:
+                continue
+            company, lever_url = result
+            rows_lever.append((lever_url, company))
+            logger.info(f"Found Lever job board for {company}: {lever_url}")
+        
+        # The probe already returned 200, so insert all found boards in one round-trip
+        companies_found = self.queue_companies(rows_lever)
+        self.flush_companies()
+        
+        logger.info(f"Completed Lever job boards discovery. Found {companies_found} companies.")
+        return companies_found
+    
+    async def discover_from_greenhouse_api(self):
+        """Check known companies against the Greenhouse job board API"""
+        
+        logger.info("Checking Greenhouse board API for known companies...")
+        sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        
+        async with self._client_session() as session:
+            async def probe_company(company, sem):
+                # Board API slugs never contain spaces
+                company_slugs = [slug for slug in COMPANY_SLUGS[company] if " " not in slug]
+                
+                for company_slug in company_slugs:
+                    greenhouse_url = f"https://boards.greenhouse.io/{company_slug}"
                     
-                    if response.status_code == 200:
-                        # Insert into database
-                        self.add_company(company, lever_url, "lever")
-                        companies_found += 1
-                        logger.info(f"Found Lever job board for {company}: {lever_url}")
-                        break  # We found a valid URL for this company, no need to try other variations
+                    # Skip if already checked this URL
+                    if self._seen(greenhouse_url):
+                        continue
                     
-                    # Be nice to Lever servers
-                    time.sleep(random.uniform(0.5, 1.5))
+                    self._mark(greenhouse_url)
+                    
+                    async with sem:
+                        try:
+                            status, body, _ = await self._fetch(
+                                session, GREENHOUSE_BOARD_API.format(slug=company_slug)
+                            )
+                        except Exception as e:
+                            logger.error(f"Error checking Greenhouse board API for {company}: {str(e)}")
+                            continue
+                    
+                    if status == 200:
+                        # The board payload carries the name the company publishes under
+                        try:
+                            board_name = json.loads(body).get("name") or company
+                        except ValueError:
+                            board_name = company
+                        return board_name, greenhouse_url  # No need to try other variations
                 
-                except Exception as e:
-                    logger.error(f"Error checking Lever job board for {company}: {str(e)}")
+                return None
+            
+            results = await asyncio.gather(
+                *[
+                    probe_company(company, sem)
+                    for company in TOP_TECH_COMPANIES
+                    if company.lower() not in self.checked_companies
+                ]
+            )
         
-        logger.info(f"Completed Lever job boards discovery. Found {companies_found} companies.")
+        rows_greenhouse = []
+        for result in results:
+            if result is None:
+                continue
+            company_name, greenhouse_url = result
+            rows_greenhouse.append((greenhouse_url, company_name))
+            self.checked_companies.add(company_name.lower())
+            logger.info(f"Found Greenhouse job board for {company_name}: {greenhouse_url}")
+        
+        companies_found = self.queue_companies(rows_greenhouse)
+        self.flush_companies()
+        
+        logger.info(f"Completed Greenhouse board API discovery. Found {companies_found} companies.")
         return companies_found
     
+    async def run_all_async(self, greenhouse=True, lever=True):
+        """Run the directory scans; Greenhouse first so Lever can skip companies it found"""
+        if greenhouse:
+            await self.scan_greenhouse_directory()
+            await self.discover_from_greenhouse_api()
+        if lever:
+            await self.scan_lever_companies()
+    
+    def queue_companies(self, rows, is_enabled=True):
+        """
+        Buffer (url, company_name) rows for the next flush, skipping URLs that are already known.
+        Returns how many of the rows were new.
+        """
+        queued = 0
+        with self._pending_lock:
+            for url, company_name in rows:
+                key = url_key(url)
+                if key in self._seen_urls:
+                    continue
+                self._seen_urls.add(key)
+                self._pending.append((url, company_name, is_enabled))
+                queued += 1
+            full = len(self._pending) >= PENDING_FLUSH_SIZE
+        
+        if full:
+            self.flush_companies()
+        return queued
+    
+    def flush_companies(self):
+        """
+        Write every buffered company URL in batches of at most PENDING_FLUSH_SIZE.
+        A batch with a bad row is retried row by row, so that row only loses itself;
+        connection failures leave the unwritten rows buffered for the next flush.
+        """
+        with self._pending_lock:
+            rows, self._pending = self._pending, []
+        
+        written = 0
+        for start in range(0, len(rows), PENDING_FLUSH_SIZE):
+            batch = rows[start:start + PENDING_FLUSH_SIZE]
+            try:
+                self._write_companies(batch)
+                written += len(batch)
+            except (OperationalError, InterfaceError) as e:
+                # Lost the connection rather than a bad row; keep the rest for the next flush
+                logger.error(f"Error adding companies, keeping {len(rows) - start} for the next flush: {str(e)}")
+                with self._pending_lock:
+                    self._pending[:0] = rows[start:]
+                break
+            except DatabaseError as e:
+                logger.error(f"Error adding {len(batch)} companies, retrying one at a time: {str(e)}")
+                for row in batch:
+                    try:
+                        self._write_companies([row])
+                        written += 1
+                    except DatabaseError as e:
+                        logger.error(f"Error adding company URL {row[0]}: {str(e)}")
+                        # Forget the URL so a later sighting can try it again
+                        with self._pending_lock:
+                            self._seen_urls.discard(url_key(row[0]))
+        
+        if written:
+            logger.info(f"Added {written} companies")
+        return written
+    
+    def _write_companies(self, rows):
+        """Stream rows to Postgres with COPY and upsert them in a single transaction"""
+        buf = io.StringIO()
+        for url, company_name, is_enabled in rows:
+            buf.write(f"{_copy_field(url)}\t{_copy_field(company_name)}\t{'t' if is_enabled else 'f'}\n")
+        buf.seek(0)
+        
+        with self._conn() as conn, conn.cursor() as cursor:
+            cursor.execute("""
+            CREATE TEMP TABLE tmp_company_urls (
+                url TEXT,
+                company_name TEXT,
+                is_enabled BOOLEAN
+            ) ON COMMIT DROP;
+            """)
+            cursor.copy_expert("COPY tmp_company_urls FROM STDIN WITH (FORMAT text)", buf)
+            cursor.execute("""
+            INSERT INTO company_urls (url, company_name, is_enabled)
+            SELECT url, company_name, is_enabled FROM tmp_company_urls
+            ON CONFLICT (url)
+            DO UPDATE SET
+                company_name = EXCLUDED.company_name,
+                is_enabled = EXCLUDED.is_enabled,
+                updated_at = CURRENT_TIMESTAMP;
+            """)
+    
+    def _verify_url(self, url):
+        """Return whether a job board URL answers with a 2xx/3xx status"""
+        headers = next(_HEADER_ITER)
+        
+        # Try HEAD request first; board status must be live, so bypass the cache
+        try:
+            response = self.session.head(
+                url, headers=headers, timeout=10, allow_redirects=True, expire_after=DO_NOT_CACHE
+            )
+            request_type = "HEAD"
+        except requests.exceptions.RequestException:
+            # If HEAD fails, try GET with stream=True to avoid downloading all content
+            response = self.session.get(
+                url, headers=headers, timeout=15, allow_redirects=True, stream=True, expire_after=DO_NOT_CACHE
+            )
+            response.close()  # Close to avoid downloading everything
+            request_type = "GET"
+        
+        # Only add valid URLs (200-399 status codes)
+        if 200 <= response.status_code < 400:
+            logger.info(f"Verified URL ({request_type}): {url} (Status: {response.status_code})")
+            return True
+        
+        logger.warning(f"Invalid URL will be disabled ({request_type}): {url} (Status: {response.status_code})")
+        return False
+    
     def add_company(self, company_name, url, board_type):
         """Add a company URL to the database after verifying it"""
-        # Skip if already checked this URL
-        if url in self.checked_urls:
+        # Skip if already checked or already stored
+        if self._seen(url) or url_key(url) in self._seen_urls:
             return True
         
         # Add to checked URLs set
-        self.checked_urls.add(url)
+        self._mark(url)
         
-        # Verify the URL first
         try:
-            headers = {'User-Agent': self.get_random_user_agent()}
-            
-            # Try HEAD request first
-            try:
-                response = requests.head(url, headers=headers, timeout=10, allow_redirects=True)
-                request_type = "HEAD"
-            except requests.exceptions.RequestException:
-                # If HEAD fails, try GET with stream=True to avoid downloading all content
-                response = requests.get(url, headers=headers, timeout=15, allow_redirects=True, stream=True)
-                response.close()  # Close to avoid downloading everything
-                request_type = "GET"
-            
-            # Only add valid URLs (200-399 status codes)
-            if 200 <= response.status_code < 400:
-                is_enabled = True
-                logger.info(f"Verified URL ({request_type}): {url} (Status: {response.status_code})")
-            else:
-                is_enabled = False
-                logger.warning(f"Invalid URL will be disabled ({request_type}): {url} (Status: {response.status_code})")
-                
-            # Add to database with appropriate is_enabled value
-            with self.conn.cursor() as cursor:
-                cursor.execute(
-                    """
-                    INSERT INTO company_urls (url, company_name, is_enabled)
-                    VALUES (%s, %s, %s)
-                    ON CONFLICT (url) 
-                    DO UPDATE SET 
-                        company_name = EXCLUDED.company_name,
-                        is_enabled = EXCLUDED.is_enabled,
-                        updated_at = CURRENT_TIMESTAMP
-                    RETURNING id;
-                    """,
-                    (url, company_name, is_enabled)
-                )
-                self.conn.commit()
-                result = cursor.fetchone()
-                if result:
-                    logger.info(f"Added/updated company: {company_name}, URL: {url} (ID: {result[0]})")
-                return True
-                
+            is_enabled = self._verify_url(url)
         except requests.exceptions.RequestException as e:
             logger.warning(f"Error verifying URL {url}: {str(e)}")
             # Add to database but mark as disabled
-            with self.conn.cursor() as cursor:
-                cursor.execute(
-                    """
-                    INSERT INTO company_urls (url, company_name, is_enabled)
-                    VALUES (%s, %s, false)
-                    ON CONFLICT (url) 
-                    DO UPDATE SET 
-                        company_name = EXCLUDED.company_name,
-                        is_enabled = false,
-                        updated_at = CURRENT_TIMESTAMP
-                    RETURNING id;
-                    """,
-                    (url, company_name)
-                )
-                self.conn.commit()
-                result = cursor.fetchone()
-                if result:
-                    logger.info(f"Added disabled company: {company_name}, URL: {url} (ID: {result[0]})")
+            self.queue_companies([(url, company_name)], is_enabled=False)
             return False
+        
+        # Add to database with appropriate is_enabled value
+        self.queue_companies([(url, company_name)], is_enabled=is_enabled)
+        return True
     
-    def search_companies(self, query, board_type, max_results=50):
-        """Search for companies using job boards"""
+    async def fetch_search_pages(self, queries):
+        """
+        Fetch the search results pages for (query, max_results) pairs concurrently.
+        Returns the page bodies in the same order, with None for requests that failed.
+        """
+        sem = asyncio.Semaphore(SEARCH_CONCURRENCY)
         
-        logger.info(f"Searching for companies with query: '{query}'")
-        search_url = f"https://www.google.com/search?q={query}&num={max_results}"
+        async with self._client_session() as session:
+            async def fetch_page(query, max_results, sem):
+                logger.info(f"Searching for companies with query: '{query}'")
+                search_url = f"https://www.google.com/search?q={query}&num={max_results}"
+                
+                async with sem:
+                    try:
+                        status, body, _ = await self._fetch(session, search_url)
+                    except Exception as e:
+                        logger.error(f"Error searching for companies: {str(e)}")
+                        return None
+                
+                if status != 200:
+                    logger.warning(f"Search request failed with status code: {status}")
+                    return None
+                return body
+            
+            return await asyncio.gather(
+                *[fetch_page(query, max_results, sem) for query, max_results in queries]
+            )
+    
+    def add_search_candidates(self, candidates, board_type):
+        """
+        Verify and queue the {job_board_url: company_name} candidates parsed from a search page.
+        Callers flush once at the end of their phase.
+        """
+        # Verifying each board is a blocking round-trip, so run them side by side
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            results = executor.map(
+                lambda candidate: self.add_company(candidate[1], candidate[0], board_type),
+                candidates.items()
+            )
+            companies_found = sum(1 for added in results if added)
+        return companies_found
+    
+    def search_all(self, searches, max_results=50):
+        """Run (query, board_type) searches concurrently, then verify and store the boards they turn up"""
+        pages = asyncio.run(self.fetch_search_pages([(query, max_results) for query, _ in searches]))
         
         companies_found = 0
-        
-        try:
-            headers = {'User-Agent': self.get_random_user_agent()}
-            response = requests.get(search_url, headers=headers, timeout=30)
+        for (query, board_type), html in zip(searches, pages):
+            if html is None:
+                continue
             
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                search_results = soup.select('.g')
-                
-                for result in search_results:
-                    link_element = result.select_one('a')
-                    if link_element and 'href' in link_element.attrs:
-                        link = link_element['href']
-                        
-                        # Extract job board URL if it exists
-                        if board_type == 'greenhouse' and 'boards.greenhouse.io' in link:
-                            # Skip if already checked
-                            if link in self.checked_urls:
-                                continue
-                                
-                            # Extract company name from title
-                            title_element = result.select_one('h3')
-                            company_name = title_element.text if title_element else "Unknown"
-                            
-                            # Clean up URL to get proper format
-                            parsed_url = urlparse(link)
-                            path_parts = parsed_url.path.split('/')
-                            
-                            if len(path_parts) > 1 and path_parts[1]:
-                                company_slug = path_parts[1].strip()
-                                job_board_url = f"https://boards.greenhouse.io/{company_slug}"
-                                
-                                # Add to database and tracking
-                                self.checked_urls.add(job_board_url)
-                                added = self.add_company(company_name, job_board_url, "greenhouse")
-                                if added:
-                                    companies_found += 1
-                        
-                        elif board_type == 'lever' and 'jobs.lever.co' in link:
-                            # Skip if already checked
-                            if link in self.checked_urls:
-                                continue
-                                
-                            # Extract company name from title
-                            title_element = result.select_one('h3')
-                            company_name = title_element.text if title_element else "Unknown"
-                            
-                            # Clean up URL to get proper format
-                            parsed_url = urlparse(link)
-                            path_parts = parsed_url.path.split('/')
-                            
-                            if len(path_parts) > 1 and path_parts[1]:
-                                company_slug = path_parts[1].strip()
-                                job_board_url = f"https://jobs.lever.co/{company_slug}"
-                                
-                                # Add to database and tracking
-                                self.checked_urls.add(job_board_url)
-                                added = self.add_company(company_name, job_board_url, "lever")
-                                if added:
-                                    companies_found += 1
-            else:
-                logger.warning(f"Search request failed with status code: {response.status_code}")
+            try:
+                found = self.add_search_candidates(parse_search_results(html, board_type), board_type)
+            except Exception as e:
+                logger.error(f"Error searching for companies: {str(e)}")
+                continue
+            
+            logger.info(f"Found {found} companies via search for {board_type}")
+            companies_found += found
+        
+        self.flush_companies()
+        return companies_found
+    
+    def search_companies(self, query, board_type, max_results=50):
+        """Search for companies using job boards"""
+        return self.search_all([(query, board_type)], max_results=max_results)
+    
+    def run_search_phase(self):
+        """Run the general Greenhouse and Lever web searches in one concurrent batch"""
+        logger.info("Starting web search for job boards...")
+        companies_found = self.search_all(
+            [(term, "greenhouse") for term in GREENHOUSE_SEARCH_TERMS]
+            + [(term, "lever") for term in LEVER_SEARCH_TERMS]
+        )
+        logger.info(f"Web search completed. Found {companies_found} new companies.")
+        return companies_found
+    
+    async def crawl_for_companies(self, seed_urls, max_depth=2):
+        """
+        Crawl outward from seed pages with a shared queue of (URL, depth) tasks.
+        Workers are paced by the per-host rate limits rather than fixed sleeps.
+        """
+        url_queue = asyncio.Queue()
+        for url in seed_urls:
+            url_queue.put_nowait((url, 0))
+        companies_found = 0
+        
+        async with self._client_session() as session:
+            async def crawl_page(current_url, depth):
+                logger.info(f"Recursively checking: {current_url} (depth {depth})")
+                status, body, _ = await self._fetch(session, current_url)
+                if status != 200:
+                    return 0
                 
-        except Exception as e:
-            logger.error(f"Error searching for companies: {str(e)}")
+                found = 0
+                # Look for links to other companies' job boards
+                for href in iter_page_hrefs(body.decode('utf-8', errors='replace')):
+                    if not href:
+                        continue
+                    
+                    # Make absolute URL if relative
+                    if href.startswith('/'):
+                        href = urljoin(current_url, href)
+                    
+                    # Check if it's a job board URL and extract the company slug
+                    match = _BOARD_RE.search(href)
+                    if not match:
+                        continue
+                    host, company_slug = match.groups()
+                    board_type = BOARD_TYPES[host]
+                    company_name = company_slug.replace('-', ' ').title()
+                    job_board_url = f"https://{host}/{company_slug}"
+                    
+                    # Verification is a blocking request, so keep it off the event loop
+                    added = await asyncio.to_thread(self.add_company, company_name, job_board_url, board_type)
+                    if added:
+                        found += 1
+                        # Add to queue for next iteration
+                        if depth + 1 < max_depth:
+                            url_queue.put_nowait((job_board_url, depth + 1))
+                return found
+            
+            async def worker():
+                nonlocal companies_found
+                while True:
+                    current_url, depth = await url_queue.get()
+                    try:
+                        # Skip pages past max depth or already checked
+                        if depth < max_depth and not self._seen(current_url):
+                            self._mark(current_url)
+                            companies_found += await crawl_page(current_url, depth)
+                    except Exception as e:
+                        logger.error(f"Error in recursive discovery for {current_url}: {str(e)}")
+                    finally:
+                        url_queue.task_done()
+            
+            workers = [asyncio.create_task(worker()) for _ in range(DISCOVERY_WORKERS)]
+            await url_queue.join()
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
         
-        logger.info(f"Found {companies_found} companies via search for {board_type}")
         return companies_found
     
     def recursive_discovery(self, seed_urls=None, max_depth=2):
@@ -467,7 +986,7 @@ class CompanyURLFinder:
         
         if not seed_urls:
             # Get some existing companies from the database as seeds
-            with self.conn.cursor() as cursor:
+            with self._conn() as conn, conn.cursor() as cursor:
                 cursor.execute("""
                 SELECT url FROM company_urls 
                 WHERE is_enabled = TRUE 
@@ -476,95 +995,9 @@ class CompanyURLFinder:
                 
                 seed_urls = [row[0] for row in cursor.fetchall()]
         
-        companies_found = 0
-        url_queue = [(url, 0) for url in seed_urls]  # (URL, depth)
-        
-        while url_queue:
-            current_url, depth = url_queue.pop(0)
-            
-            # Skip if we've reached max depth
-            if depth >= max_depth:
-                continue
-                
-            # Skip if already checked
-            if current_url in self.checked_urls:
-                continue
-                
-            self.checked_urls.add(current_url)
-            
-            try:
-                logger.info(f"Recursively checking: {current_url} (depth {depth})")
-                headers = {'User-Agent': self.get_random_user_agent()}
-                response = requests.get(current_url, headers=headers, timeout=30)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # 1. Look for "similar companies" or "customers" sections
-                    potential_company_links = []
-                    
-                    # Find links containing "careers", "jobs", "hiring", etc.
-                    job_related_links = soup.find_all('a', href=lambda href: href and any(
-                        keyword in href.lower() for keyword in ['career', 'job', 'hiring', 'work', 'position']
-                    ))
-                    
-                    for link in job_related_links:
-                        href = link.get('href')
-                        if not href:
-                            continue
-                            
-                        # Make absolute URL if relative
-                        if href.startswith('/'):
-                            href = urljoin(current_url, href)
-                            
-                        # Check if it's a job board URL
-                        if 'boards.greenhouse.io' in href or 'jobs.lever.co' in href:
-                            potential_company_links.append(href)
-                    
-                    # Process discovered links
-                    for link in potential_company_links:
-                        if 'boards.greenhouse.io' in link:
-                            # Extract company slug
-                            parsed_url = urlparse(link)
-                            path_parts = parsed_url.path.split('/')
-                            
-                            if len(path_parts) > 1 and path_parts[1]:
-                                company_slug = path_parts[1].strip()
-                                company_name = company_slug.replace('-', ' ').title()
-                                job_board_url = f"https://boards.greenhouse.io/{company_slug}"
-                                
-                                # Add to database
-                                added = self.add_company(company_name, job_board_url, "greenhouse")
-                                if added:
-                                    companies_found += 1
-                                    # Add to queue for next iteration
-                                    if depth + 1 < max_depth:
-                                        url_queue.append((job_board_url, depth + 1))
-                                    
-                        elif 'jobs.lever.co' in link:
-                            # Extract company slug
-                            parsed_url = urlparse(link)
-                            path_parts = parsed_url.path.split('/')
-                            
-                            if len(path_parts) > 1 and path_parts[1]:
-                                company_slug = path_parts[1].strip()
-                                company_name = company_slug.replace('-', ' ').title()
-                                job_board_url = f"https://jobs.lever.co/{company_slug}"
-                                
-                                # Add to database
-                                added = self.add_company(company_name, job_board_url, "lever")
-                                if added:
-                                    companies_found += 1
-                                    # Add to queue for next iteration
-                                    if depth + 1 < max_depth:
-                                        url_queue.append((job_board_url, depth + 1))
-                    
-                    # Be nice to servers
-                    time.sleep(random.uniform(1, 2))
-            
-            except Exception as e:
-                logger.error(f"Error in recursive discovery for {current_url}: {str(e)}")
+        companies_found = asyncio.run(self.crawl_for_companies(seed_urls, max_depth=max_depth))
         
+        self.flush_companies()
         logger.info(f"Recursive discovery completed. Found {companies_found} new companies.")
         return companies_found
     
@@ -574,68 +1007,64 @@ class CompanyURLFinder:
         using targeted queries
         """
         logger.info("Starting industry-specific company search...")
-        total_companies_found = 0
         
+        queries = []
         for industry, keywords in INDUSTRY_PATTERNS.items():
-            logger.info(f"Searching {industry} industry...")
-            industry_companies_found = 0
-            
             for keyword in keywords:
-                # Search for Greenhouse companies in this industry
-                gh_query = f"{keyword} companies site:boards.greenhouse.io"
-                companies_found = self.search_companies(gh_query, "greenhouse", max_results=30)
-                industry_companies_found += companies_found
-                
-                # Be nice to search engines
-                time.sleep(random.uniform(2, 4))
-                
-                # Search for Lever companies in this industry
-                lever_query = f"{keyword} companies site:jobs.lever.co"
-                companies_found = self.search_companies(lever_query, "lever", max_results=30)
-                industry_companies_found += companies_found
-                
-                # Be nice to search engines
-                time.sleep(random.uniform(2, 4))
-                
-                # For more targeted results, try industry + job board provider
-                gh_provider_query = f"{keyword} greenhouse job board"
-                companies_found = self.search_companies(gh_provider_query, "greenhouse", max_results=20)
-                industry_companies_found += companies_found
-                
-                # Be nice to search engines
-                time.sleep(random.uniform(2, 4))
-                
-                lever_provider_query = f"{keyword} lever job board"
-                companies_found = self.search_companies(lever_provider_query, "lever", max_results=20)
-                industry_companies_found += companies_found
-                
-                # Be nice to search engines
-                time.sleep(random.uniform(2, 4))
+                queries += [
+                    # Search for Greenhouse and Lever companies in this industry
+                    (industry, f"{keyword} companies site:boards.greenhouse.io", "greenhouse", 30),
+                    (industry, f"{keyword} companies site:jobs.lever.co", "lever", 30),
+                    # For more targeted results, try industry + job board provider
+                    (industry, f"{keyword} greenhouse job board", "greenhouse", 20),
+                    (industry, f"{keyword} lever job board", "lever", 20),
+                ]
+        
+        industry_companies_found = dict.fromkeys(INDUSTRY_PATTERNS, 0)
+        
+        # Pages are fetched concurrently under the search engine's rate limit,
+        # then parsing fans out across every core
+        pages = asyncio.run(self.fetch_search_pages(
+            [(query, max_results) for _, query, _, max_results in queries]
+        ))
+        
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            parsed = [
+                (industry, board_type, executor.submit(parse_search_results, html, board_type))
+                for (industry, _, board_type, _), html in zip(queries, pages)
+                if html is not None
+            ]
             
-            logger.info(f"Found {industry_companies_found} companies in {industry} industry")
-            total_companies_found += industry_companies_found
+            # Single writer: verify and insert everything the workers parsed
+            for industry, board_type, future in parsed:
+                try:
+                    candidates = future.result()
+                except Exception as e:
+                    logger.error(f"Error parsing search results for {industry}: {str(e)}")
+                    continue
+                industry_companies_found[industry] += self.add_search_candidates(candidates, board_type)
+        self.flush_companies()
+        
+        for industry, companies_found in industry_companies_found.items():
+            logger.info(f"Found {companies_found} companies in {industry} industry")
+        total_companies_found = sum(industry_companies_found.values())
         
         logger.info(f"Industry-specific search completed. Found {total_companies_found} companies total.")
         return total_companies_found
     
     def get_stats(self):
         """Get statistics about the companies database"""
-        with self.conn.cursor() as cursor:
-            # Count total companies
-            cursor.execute("SELECT COUNT(*) FROM company_urls")
-            total_companies = cursor.fetchone()[0]
-            
-            # Count enabled URLs for scraping
-            cursor.execute("SELECT COUNT(*) FROM company_urls WHERE is_enabled = TRUE")
-            enabled_urls = cursor.fetchone()[0]
-            
-            # Count greenhouse URLs
-            cursor.execute("SELECT COUNT(*) FROM company_urls WHERE url LIKE '%boards.greenhouse.io%'")
-            greenhouse_urls = cursor.fetchone()[0]
-            
-            # Count lever URLs
-            cursor.execute("SELECT COUNT(*) FROM company_urls WHERE url LIKE '%jobs.lever.co%'")
-            lever_urls = cursor.fetchone()[0]
+        with self._conn() as conn, conn.cursor() as cursor:
+            # Count everything in a single scan of the table
+            cursor.execute("""
+            SELECT
+                COUNT(*),
+                COUNT(*) FILTER (WHERE is_enabled = TRUE),
+                COUNT(*) FILTER (WHERE url LIKE '%boards.greenhouse.io%'),
+                COUNT(*) FILTER (WHERE url LIKE '%jobs.lever.co%')
+            FROM company_urls
+            """)
+            total_companies, enabled_urls, greenhouse_urls, lever_urls = cursor.fetchone()
             
             return {
                 "total_companies": total_companies,
@@ -651,62 +1080,17 @@ class CompanyURLFinder:
         # Get initial stats
         initial_stats = self.get_stats()
         
-        # 1. Scan Greenhouse directory
-        self.scan_greenhouse_directory()
-        
+        # 1. Scan Greenhouse directory and board API
         # 2. Discover Lever job boards
-        self.scan_lever_companies()
-        
-        # 3. Search for Greenhouse companies using different search terms
-        greenhouse_search_terms = [
-            "site:boards.greenhouse.io careers",
-            "site:boards.greenhouse.io jobs",
-            "apply through greenhouse io",
-            "powered by greenhouse",
-            "apply for this job greenhouse",
-            "we use greenhouse",
-            "greenhouse applicant tracking",
-            "greenhouse ats jobs",
-            "using greenhouse for jobs",
-            "careers greenhouse",
-            "join our team greenhouse",
-            "open positions greenhouse"
-        ]
-        
-        for term in greenhouse_search_terms:
-            self.search_companies(term, "greenhouse")
-            time.sleep(random.uniform(3, 6))  # Avoid rate limiting
-        
-        # 4. Search for Lever companies
-        lever_search_terms = [
-            "site:jobs.lever.co careers",
-            "site:jobs.lever.co apply",
-            "apply through lever.co",
-            "powered by lever",
-            "apply for this job lever",
-            "we use lever",
-            "lever applicant tracking",
-            "lever ats jobs",
-            "using lever for jobs",
-            "careers lever",
-            "join our team lever",
-            "open positions lever"
-        ]
-        
-        for term in lever_search_terms:
-            self.search_companies(term, "lever")
-            time.sleep(random.uniform(3, 6))  # Avoid rate limiting
-        
-        # 5. Perform recursive discovery
-        self.recursive_discovery(max_depth=2)
+        asyncio.run(self.run_all_async())
         
-        # 6. Perform industry-specific searches
-        self.industry_specific_search()
+        # 3. Perform recursive discovery
+        self.recursive_discovery(max_depth=2)
         
         # Get final stats
         final_stats = self.get_stats()
         
-        logger.info(f"Company URL Finder complete")
+        logger.info("Company URL Finder complete")
         logger.info(f"Initial companies: {initial_stats['total_companies']}")
         logger.info(f"Final companies: {final_stats['total_companies']}")
         logger.info(f"New companies found: {final_stats['total_companies'] - initial_stats['total_companies']}")
@@ -717,12 +1101,12 @@ class CompanyURLFinder:
 if __name__ == "__main__":
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Find company job board URLs')
-    parser.add_argument('--all', action='store_true', help='Run all discovery methods')
-    parser.add_argument('--greenhouse', action='store_true', help='Scan Greenhouse directory')
+    parser.add_argument('--all', action='store_true', help='Run all API and directory discovery methods')
+    parser.add_argument('--greenhouse', action='store_true', help='Scan Greenhouse directory and board API')
     parser.add_argument('--lever', action='store_true', help='Discover Lever job boards')
-    parser.add_argument('--search', action='store_true', help='Perform web searches for job board URLs')
+    parser.add_argument('--search', action='store_true', help='Perform web searches for job board URLs (not part of --all)')
     parser.add_argument('--recursive', action='store_true', help='Perform recursive discovery of related companies')
-    parser.add_argument('--industry', action='store_true', help='Perform industry-specific searches')
+    parser.add_argument('--industry', action='store_true', help='Perform industry-specific searches (not part of --all)')
     
     args = parser.parse_args()
     
@@ -731,44 +1115,24 @@ if __name__ == "__main__":
     # Default behavior is to run everything if no specific option is selected
     run_all = args.all or not (args.greenhouse or args.lever or args.search or args.recursive or args.industry)
     
-    if run_all or args.greenhouse:
-        finder.scan_greenhouse_directory()
-    
-    if run_all or args.lever:
-        finder.scan_lever_companies()
+    if run_all or args.greenhouse or args.lever:
+        asyncio.run(finder.run_all_async(
+            greenhouse=run_all or args.greenhouse,
+            lever=run_all or args.lever,
+        ))
     
-    if run_all or args.search:
-        # Greenhouse search terms
-        greenhouse_search_terms = [
-            "site:boards.greenhouse.io careers",
-            "powered by greenhouse",
-            "greenhouse ats jobs"
-        ]
-        
-        for term in greenhouse_search_terms:
-            finder.search_companies(term, "greenhouse")
-            time.sleep(random.uniform(2, 5))
-        
-        # Lever search terms
-        lever_search_terms = [
-            "site:jobs.lever.co careers",
-            "powered by lever",
-            "lever ats jobs"
-        ]
-        
-        for term in lever_search_terms:
-            finder.search_companies(term, "lever")
-            time.sleep(random.uniform(2, 5))
+    if args.search:
+        finder.run_search_phase()
     
     if run_all or args.recursive:
         finder.recursive_discovery()
         
-    if run_all or args.industry:
+    if args.industry:
         finder.industry_specific_search()
     
     # Print final stats
     stats = finder.get_stats()
-    logger.info(f"Company URL Finder complete")
+    logger.info("Company URL Finder complete")
     logger.info(f"Total companies: {stats['total_companies']}")
     logger.info(f"Greenhouse URLs: {stats['greenhouse_urls']}")
     logger.info(f"Lever URLs: {stats['lever_urls']}")
@@ -9,12 +9,11 @@ import psycopg2
 from msgspec.json import decode
 from msgspec import Struct
 from typing import Optional
-from datetime import datetime
 from job_board_scraper.utils import general as util
 
 
 def determine_row_id(spider_id, url_id, row_id, created_at, k=0):
-    return util.hash_ids.encode(spider_id, url_id, row_id, created_at, k)
+    return util.hash_encode(spider_id, url_id, row_id, created_at, k)
 
 
 def set_initial_table_schema(table_name):
@@ -105,7 +104,7 @@ ashby_teams_id = 3
 ashby_postings_id = 4
 ashby_locations_id = 5
 
-run_hash = util.hash_ids.encode(int(time.time()))
+run_hash = util.hash_encode(int(time.time()))
 
 pg_host = os.environ.get("PG_HOST")
 pg_user = os.environ.get("PG_USER")
@@ -152,7 +151,7 @@ for i, url in enumerate(careers_page_urls):
     current_time = time.time()
     created_at = int(current_time)
     updated_at = int(current_time)
-    current_date_utc = datetime.utcfromtimestamp(current_time).strftime("%Y-%m-%d")
+    current_date_utc = util.utc_date(current_time)
 
     s3_json_path = f"requests/ashby/date={current_date_utc}/company={ashby_company}/{ashby_company}-ashby.json"
     full_s3_json_path = (
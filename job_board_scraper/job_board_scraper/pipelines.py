@@ -7,35 +7,29 @@
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
 from job_board_scraper.utils import pipline_util
+from job_board_scraper.utils import postgres_wrapper
 
 from io import BytesIO
 from dotenv import load_dotenv
 
-import os
 import logging
-import psycopg2
+from psycopg2.extras import execute_batch
+from twisted.internet import defer, threads
 
 logger = logging.getLogger("logger")
 
+# Items are written in one transaction once this many are waiting
+ITEM_BATCH_SIZE = 100
+
 
 class JobScraperPipelinePostgres:
     def __init__(self):
-        ## Connection Details
-        self.hostname = os.environ.get("PG_HOST")
-        self.username = os.environ.get("PG_USER")
-        self.password = os.environ.get("PG_PASSWORD")
-        self.database = os.environ.get("PG_DATABASE")
-
-        ## Create/Connect to database
-        self.connection = psycopg2.connect(
-            host=self.hostname,
-            user=self.username,
-            password=self.password,
-            dbname=self.database,
-        )
+        ## Connections are borrowed from the process-wide pool per write, rather than each
+        ## crawler opening its own for the whole crawl
 
-        ## Create cursor, used to execute commands
-        self.cur = self.connection.cursor()
+        ## Rows waiting to be written, and the chain of writes running off the reactor thread
+        self.pending_rows = []
+        self.writes = defer.succeed(None)
 
     def open_spider(self, spider):
         self.table_name = spider.name
@@ -43,19 +37,47 @@ class JobScraperPipelinePostgres:
         create_table_statement = pipline_util.create_table_schema(
             self.table_name, initial_table_schema
         )
-        self.cur.execute(create_table_statement)
+        # Off the reactor thread like the writes, which queue behind it so the table exists first
+        self.writes = threads.deferToThread(self.create_table, create_table_statement)
+        self.writes.addErrback(
+            lambda failure: logger.error(f"Error creating {self.table_name}: {failure.value}")
+        )
+
+    def create_table(self, create_table_statement):
+        with postgres_wrapper.get_conn() as connection:
+            with connection, connection.cursor() as cur:
+                cur.execute(create_table_statement)
 
     def process_item(self, item, spider):
-        ## Execute insert of data into database
-        insert_item_statement, table_values_list = pipline_util.create_insert_item(
+        ## Queue the insert; the statement only depends on the table, so rows batch together
+        self.insert_item_statement, table_values_list = pipline_util.create_insert_item(
             self.table_name, item
         )
-        # logger.info(f"INSERT STMT {insert_item_statement} ____ {table_values_list}")
-        self.cur.execute(insert_item_statement, tuple(table_values_list))
-        self.connection.commit()
+        # logger.info(f"INSERT STMT {self.insert_item_statement} ____ {table_values_list}")
+        self.pending_rows.append(tuple(table_values_list))
+        if len(self.pending_rows) >= ITEM_BATCH_SIZE:
+            self.flush_rows()
         return item
 
+    def flush_rows(self):
+        """Write the queued rows in a thread, so commits never stall the downloads sharing the reactor"""
+        if not self.pending_rows:
+            return
+        rows = self.pending_rows
+        self.pending_rows = []
+        # Chained rather than concurrent, so one spider holds at most one pooled connection
+        self.writes.addCallback(lambda _: threads.deferToThread(self.write_rows, rows))
+        self.writes.addErrback(
+            lambda failure: logger.error(f"Error writing {self.table_name} rows: {failure.value}")
+        )
+
+    def write_rows(self, rows):
+        ## The connection block commits, or rolls back if the batch fails
+        with postgres_wrapper.get_conn() as connection:
+            with connection, connection.cursor() as cur:
+                execute_batch(cur, self.insert_item_statement, rows)
+
     def close_spider(self, spider):
-        ## Close cursor & connection to database
-        self.cur.close()
-        self.connection.close()
+        ## Write what is left; Scrapy waits on the returned Deferred before closing the spider
+        self.flush_rows()
+        return self.writes
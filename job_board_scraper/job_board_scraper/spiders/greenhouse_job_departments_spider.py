@@ -6,9 +6,6 @@ from dotenv import load_dotenv
 from job_board_scraper.items import GreenhouseJobDepartmentsItem
 from job_board_scraper.utils import general as util
 from scrapy.loader import ItemLoader
-from scrapy.selector import Selector
-from scrapy.utils.project import get_project_settings
-from datetime import datetime
 
 load_dotenv()
 # logger = logging.getLogger("logger")
@@ -24,19 +21,15 @@ class GreenhouseJobDepartmentsSpider(scrapy.Spider):
         self.careers_page_url = kwargs.pop("careers_page_url")
         self.run_hash = kwargs.pop("run_hash")
         self.url_id = kwargs.pop("url_id", 0)
-        self.html_source = (
-            self.careers_page_url[:-1]
-            if self.careers_page_url[-1] == "/"
-            else self.careers_page_url
+        self.html_source = self.careers_page_url.rstrip("/")
+        # Greenhouse serves two page layouts; work out which one once, not on every page
+        self.is_job_boards_variant = (
+            self.careers_page_url.split(".")[0].split("/")[-1] == "job-boards"
         )
-        self.settings = get_project_settings()
         self.current_time = time.time()
-        self.page_number = 1  # default
         self.updated_at = int(self.current_time)
         self.created_at = int(self.current_time)
-        self.current_date_utc = datetime.utcfromtimestamp(self.current_time).strftime(
-            "%Y-%m-%d"
-        )
+        self.current_date_utc = util.utc_date(self.current_time)
         self.logger.info(f"Initialized Spider, {self.html_source}")
 
     @property
@@ -51,30 +44,29 @@ class GreenhouseJobDepartmentsSpider(scrapy.Spider):
         # Traditional format
         return self.html_source.split("/")[-1].split("?")[0]
 
+    def get_callback(self):
+        return self.parse_job_boards if self.is_job_boards_variant else self.parse_classic
+
     def start_requests(self):
-        yield scrapy.Request(url=self.url, callback=self.parse)
+        yield scrapy.Request(url=self.url, callback=self.get_callback())
 
     def determine_row_id(self, i):
-        return util.hash_ids.encode(
-            self.spider_id, i, self.url_id, int(self.created_at)
-        )
+        # created_at is already an int, so only the row index varies between calls
+        return util.hash_encode(self.spider_id, i, self.url_id, self.created_at)
 
     def finalize_response(self, response):
         return response.text
 
     # Greenhouse has exposed a new URL with different features for scraping for some companies
-    def parse_job_boards_prefix(self, i, department):
-        il = ItemLoader(
-            item=GreenhouseJobDepartmentsItem(),
-            selector=Selector(text=department.get(), type="html"),
-        )
-        self.logger.info(f"Parsing row {i+1}, {self.company_name}, {self.name}")
+    def parse_job_boards_prefix(self, i, department, page=1):
+        il = ItemLoader(item=GreenhouseJobDepartmentsItem())
+        self.logger.debug("Parsing row %s, %s, %s", i + 1, self.company_name, self.name)
 
         il.add_value("department_id", self.company_name + "_" + department.get())
         il.add_value("department_name", department.get())
         il.add_value("department_category", "level-0")
 
-        il.add_value("id", self.determine_row_id(i))
+        il.add_value("id", self.determine_row_id(page * 1000 + i))
         il.add_value("created_at", self.created_at)
         il.add_value("updated_at", self.updated_at)
 
@@ -85,46 +77,78 @@ class GreenhouseJobDepartmentsSpider(scrapy.Spider):
         return il
 
     def parse(self, response):
-        response_html = self.finalize_response(response)
-        selector = Selector(text=response_html, type="html")
-        if self.careers_page_url.split(".")[0].split("/")[-1] == "job-boards":
-            all_departments = selector.xpath(
-                "//div[(@class='job-posts')]/*[starts-with(name(), 'h')]/text()"
-            )
-            for i, department in enumerate(all_departments):
-                il = self.parse_job_boards_prefix(i, department)
-                yield il.load_item()
-            if len(all_departments) != 0:
-                self.page_number += 1
+        return self.get_callback()(response)
+
+    def log_rows_parsed(self, count):
+        # One summary line per page; the per-row lines are debug only
+        self.logger.info("Parsed %d rows, %s, %s", count, self.company_name, self.name)
+
+    def get_last_page(self, selector):
+        """Highest page number linked from the job-boards pager, or 1 without one"""
+        pages = selector.xpath("//a/@href").re(r"[?&]page=(\d+)")
+        return max((int(page) for page in pages), default=1)
+
+    def follow_pages(self, response, page, last_page, has_rows, callback):
+        if page == 1:
+            # The pager on the first page lists the rest, so request them side by side
+            for next_page in range(2, last_page + 1):
                 yield response.follow(
-                    self.careers_page_url + f"?page={self.page_number}", self.parse
+                    self.careers_page_url + f"?page={next_page}",
+                    callback,
+                    cb_kwargs={"page": next_page, "last_page": last_page},
                 )
+        if page >= last_page and has_rows:
+            # Keep walking past the pager's last page in case it was truncated
+            yield response.follow(
+                self.careers_page_url + f"?page={page + 1}",
+                callback,
+                cb_kwargs={"page": page + 1, "last_page": last_page},
+            )
 
-        else:
-            all_departments = selector.xpath('//section[contains(@class, "level")]')
+    def parse_job_boards(self, response, page=1, last_page=None):
+        response_html = self.finalize_response(response)
+        selector = util.html_selector(response_html)
+        all_departments = selector.xpath(
+            "//div[(@class='job-posts')]/*[starts-with(name(), 'h')]/text()"
+        )
+        for i, department in enumerate(all_departments):
+            il = self.parse_job_boards_prefix(i, department, page)
+            yield il.load_item()
+        self.log_rows_parsed(len(all_departments))
+        yield from self.follow_pages(
+            response,
+            page,
+            last_page or self.get_last_page(selector),
+            len(all_departments) != 0,
+            self.parse_job_boards,
+        )
 
-            for i, department in enumerate(all_departments):
-                il = ItemLoader(
-                    item=GreenhouseJobDepartmentsItem(),
-                    selector=Selector(text=department.get(), type="html"),
-                )
-                dept_loader = il.nested_xpath(
-                    f"//section[contains(@class, 'level')]/*[starts-with(name(), 'h')]"
-                )
-                self.logger.info(f"Parsing row {i+1}, {self.company_name}, {self.name}")
+    def parse_classic(self, response):
+        response_html = self.finalize_response(response)
+        selector = util.html_selector(response_html)
+        all_departments = selector.xpath('//section[contains(@class, "level")]')
 
-                dept_loader.add_xpath("department_id", "@id")
-                dept_loader.add_xpath("department_name", "text()")
-                il.add_xpath(
-                    "department_category", "//section[contains(@class, 'level')]/@class"
-                )
+        for i, department in enumerate(all_departments):
+            il = ItemLoader(item=GreenhouseJobDepartmentsItem(), selector=department)
+            dept_loader = il.nested_xpath(
+                "descendant-or-self::section[contains(@class, 'level')]/*[starts-with(name(), 'h')]"
+            )
+            self.logger.debug("Parsing row %s, %s, %s", i + 1, self.company_name, self.name)
+
+            dept_loader.add_xpath("department_id", "@id")
+            dept_loader.add_xpath("department_name", "text()")
+            il.add_xpath(
+                "department_category",
+                "descendant-or-self::section[contains(@class, 'level')]/@class",
+            )
 
-                il.add_value("id", self.determine_row_id(i))
-                il.add_value("created_at", self.created_at)
-                il.add_value("updated_at", self.updated_at)
+            il.add_value("id", self.determine_row_id(i))
+            il.add_value("created_at", self.created_at)
+            il.add_value("updated_at", self.updated_at)
 
-                il.add_value("source", self.html_source)
-                il.add_value("company_name", self.company_name)
-                il.add_value("run_hash", self.run_hash)
+            il.add_value("source", self.html_source)
+            il.add_value("company_name", self.company_name)
+            il.add_value("run_hash", self.run_hash)
 
-                yield il.load_item()
+            yield il.load_item()
+        self.log_rows_parsed(len(all_departments))
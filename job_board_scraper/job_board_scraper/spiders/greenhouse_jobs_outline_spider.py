@@ -1,40 +1,59 @@
 import scrapy
-import time
-import os
 from dotenv import load_dotenv
 from job_board_scraper.items import GreenhouseJobsOutlineItem
 from job_board_scraper.utils import general as util
+from job_board_scraper.utils import postgres_wrapper
 from job_board_scraper.spiders.greenhouse_job_departments_spider import (
     GreenhouseJobDepartmentsSpider,
 )
-from scrapy.loader import ItemLoader
-from scrapy.selector import Selector
-from scrapy.utils.project import get_project_settings
-from datetime import datetime
-import psycopg2
+from lxml import etree
 from scrapy.spidermiddlewares.httperror import HttpError
+from twisted.internet import threads
 from twisted.internet.error import DNSLookupError, TCPTimedOutError, TimeoutError
 
 load_dotenv()
 
+
+def compile_xpaths(xpaths):
+    """Compile {field: xpath} once so rows don't re-parse the same expressions"""
+    return {field: etree.XPath(xpath) for field, xpath in xpaths.items()}
+
+
 class GreenhouseJobsOutlineSpider(GreenhouseJobDepartmentsSpider):
     name = "greenhouse_jobs_outline"
     allowed_domains = ["boards.greenhouse.io", "job-boards.greenhouse.io"]
+    # Openings turn over faster than departments, so cached listings go stale sooner
+    custom_settings = {"HTTPCACHE_EXPIRATION_SECS": 60 * 60}
+
+    job_boards_xpaths = compile_xpaths({
+        "opening_link": ".//a/@href",
+        "opening_title": ".//p[contains(@class, 'body--medium')]/text()",
+        "location": ".//p[contains(@class, 'body--metadata')]/text()",
+    })
+    # The opening div itself carries the department and office ids
+    classic_xpaths = compile_xpaths({
+        "department_ids": "@department_id",
+        "office_ids": "@office_id",
+        "opening_link": ".//a/@href",
+        "opening_title": ".//a/text()",
+        "location": ".//span/text()",
+    })
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.spider_id = kwargs.pop("spider_id", 2)
         self.logger.info(f"Initialized Spider, {self.html_source}")
-        self.page_number = 1
         # Add a retry counter
         self.retry_counts = {}
         self.max_retries = 3  # Only disable after 3 failures
+        # Disable update still running off the reactor thread, if any
+        self.pending_disable = None
 
     def start_requests(self):
         # Override the parent's start_requests to add error handling
         yield scrapy.Request(
             url=self.url, 
-            callback=self.parse,
+            callback=self.get_callback(),
             errback=self.errback_httpbin,
             dont_filter=True
         )
@@ -49,7 +68,7 @@ class GreenhouseJobsOutlineSpider(GreenhouseJobDepartmentsSpider):
             response = failure.value.response
             self.logger.error(f"HttpError on {response.url} with status {response.status}")
             
-            # If it's a 404, mark the URL as disabled in the database immediately
+            # If it's a 404, mark the URL as disabled in the database
             if response.status == 404:
                 self.mark_url_as_disabled()
                 
@@ -73,118 +92,105 @@ class GreenhouseJobsOutlineSpider(GreenhouseJobDepartmentsSpider):
                 self.logger.info(f"Will retry URL {self.url} later (attempt {self.retry_counts[self.url]} of {self.max_retries})")
     
     def mark_url_as_disabled(self):
-        """Mark the URL as disabled in the database"""
+        """Mark the URL as disabled in a thread, so the UPDATE never blocks the reactor"""
+        if self.pending_disable is None:
+            self.pending_disable = threads.deferToThread(self.update_disabled_url, self.url)
+
+    def update_disabled_url(self, url):
+        """Mark the URL as disabled with a single UPDATE on a pooled connection"""
         try:
-            # Connect to the database
-            connection = psycopg2.connect(
-                host=os.environ.get("PG_HOST"),
-                user=os.environ.get("PG_USER"),
-                password=os.environ.get("PG_PASSWORD"),
-                dbname=os.environ.get("PG_DATABASE"),
-            )
-            
-            cursor = connection.cursor()
-            
-            # Use self.url instead of self.html_source as it's more reliable
-            cursor.execute(
-                "UPDATE company_urls SET is_enabled=false, updated_at=CURRENT_TIMESTAMP WHERE url=%s RETURNING id;",
-                (self.url,)
-            )
-            
-            # Get the ID of the updated row if any
-            result = cursor.fetchone()
-            
-            if result:
-                self.logger.info(f"Marked URL {self.url} as disabled (ID: {result[0]})")
+            with postgres_wrapper.get_conn() as connection:
+                with connection, connection.cursor() as cursor:
+                    cursor.execute(
+                        "UPDATE company_urls SET is_enabled=false, updated_at=CURRENT_TIMESTAMP WHERE url=%s RETURNING url;",
+                        (url,)
+                    )
+                    updated = cursor.fetchone() is not None
+
+            if updated:
+                self.logger.info(f"Marked URL {url} as disabled")
             else:
-                self.logger.warning(f"URL {self.url} not found in database")
-            
-            connection.commit()
-            cursor.close()
-            connection.close()
-            
+                self.logger.warning(f"URL {url} not found in database")
+
         except Exception as e:
             self.logger.error(f"Error updating database: {str(e)}")
 
-    def get_department_ids(self, job_post):
-        stratified_selector = Selector(text=job_post.get(), type="html")
+    def closed(self, reason):
+        # spider_closed waits on the returned Deferred, so the write finishes before shutdown
+        return self.pending_disable
+
+    def extract_xpaths(self, selector, xpaths):
+        """First non-empty match of each compiled XPath, as TakeFirst would pick it"""
+        root = selector.root
+        return {
+            field: next((str(value) for value in xpath(root) if value), None)
+            for field, xpath in xpaths.items()
+        }
+
+    def make_item(self, item_class, row_id, **fields):
+        # Rows only need TakeFirst semantics, so build items directly rather than via ItemLoader
+        return item_class(
+            id=row_id,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            source=self.html_source,
+            run_hash=self.run_hash,
+            **fields,
+        )
 
-        primary_department = stratified_selector.xpath(
-            "//*[starts-with(name(), 'h')]/text()"
+    def get_department_ids(self, job_post):
+        primary_department = job_post.xpath(
+            ".//*[starts-with(name(), 'h')]/text()"
         ).get()
 
         department_ids = self.company_name + "_" + primary_department
 
-        job_openings = stratified_selector.xpath("//td[@class='cell']")
+        job_openings = job_post.xpath(".//td[@class='cell']")
 
         return department_ids, job_openings
 
-    def parse_job_boards_prefix(self, i, j, department_ids, opening):
-        il = ItemLoader(
-            item=GreenhouseJobsOutlineItem(),
-            selector=Selector(text=opening.get(), type="html"),
+    def parse_job_boards_prefix(self, i, j, department_ids, opening, page=1):
+        return self.make_item(
+            GreenhouseJobsOutlineItem,
+            self.determine_row_id(page * 1_000_000 + i * 1000 + j),
+            department_ids=department_ids,
+            **self.extract_xpaths(opening, self.job_boards_xpaths),
         )
 
-        il.add_value("department_ids", department_ids)
-        il.add_xpath("opening_link", "//a/@href")
-        il.add_xpath("opening_title", "//p[contains(@class, 'body--medium')]/text()")
-        il.add_xpath("location", "//p[contains(@class, 'body--metadata')]/text()")
-
-        il.add_value(
-            "id",
-            self.determine_row_id(
-                int(str(i * 100) + str(j * 100) + str(self.page_number))
-            ),
+    def parse_job_boards(self, response, page=1, last_page=None):
+        response_html = self.finalize_response(response)
+        selector = util.html_selector(response_html)
+        job_posts = selector.xpath("//div[(@class='job-posts')]")
+        rows = 0
+        for i, job_post in enumerate(job_posts):
+            department_ids, job_openings = self.get_department_ids(job_post)
+            for j, opening in enumerate(job_openings):
+                item = self.parse_job_boards_prefix(i, j, department_ids, opening, page)
+                self.logger.debug(
+                    "Parsed row %s %s", item.get("opening_title"), item.get("id")
+                )
+                rows += 1
+                yield item
+        self.log_rows_parsed(rows)
+        yield from self.follow_pages(
+            response,
+            page,
+            last_page or self.get_last_page(selector),
+            len(job_posts) != 0,
+            self.parse_job_boards,
         )
-        il.add_value("created_at", self.created_at)
-        il.add_value("updated_at", self.updated_at)
-        il.add_value("source", self.html_source)
-        il.add_value("run_hash", self.run_hash)
-
-        return il
 
-    def parse(self, response):
+    def parse_classic(self, response):
         response_html = self.finalize_response(response)
-        selector = Selector(text=response_html, type="html")
-        if self.careers_page_url.split(".")[0].split("/")[-1] == "job-boards":
-            job_posts = selector.xpath("//div[(@class='job-posts')]")
-            for i, job_post in enumerate(job_posts):
-                department_ids, job_openings = self.get_department_ids(job_post)
-                for j, opening in enumerate(job_openings):
-                    il = self.parse_job_boards_prefix(i, j, department_ids, opening)
-                    print(
-                        il.load_item().get("opening_title"),
-                        il.load_item().get("id"),
-                    )
-                    yield il.load_item()
-            if len(job_posts) != 0:
-                self.page_number += 1
-                yield response.follow(
-                    url=self.careers_page_url + f"?page={self.page_number}",
-                    callback=self.parse,
-                )
+        selector = util.html_selector(response_html)
+        job_openings = selector.xpath('//div[@class="opening"]')
 
-        else:
-            job_openings = selector.xpath('//div[@class="opening"]')
+        for i, opening in enumerate(job_openings):
+            self.logger.debug("Parsing row %s, %s, %s", i + 1, self.company_name, self.name)
 
-            for i, opening in enumerate(job_openings):
-                il = ItemLoader(
-                    item=GreenhouseJobsOutlineItem(),
-                    selector=Selector(text=opening.get(), type="html"),
-                )
-                self.logger.info(f"Parsing row {i+1}, {self.company_name} {self.name}")
-                nested = il.nested_xpath('//div[@class="opening"]')
-
-                nested.add_xpath("department_ids", "@department_id")
-                nested.add_xpath("office_ids", "@office_id")
-                il.add_xpath("opening_link", "//a/@href")
-                il.add_xpath("opening_title", "//a/text()")
-                il.add_xpath("location", "//span/text()")
-
-                il.add_value("id", self.determine_row_id(i))
-                il.add_value("created_at", self.created_at)
-                il.add_value("updated_at", self.updated_at)
-                il.add_value("source", self.html_source)
-                il.add_value("run_hash", self.run_hash)
-
-                yield il.load_item()
+            yield self.make_item(
+                GreenhouseJobsOutlineItem,
+                self.determine_row_id(i),
+                **self.extract_xpaths(opening, self.classic_xpaths),
+            )
+        self.log_rows_parsed(len(job_openings))
@@ -1,16 +1,12 @@
 import scrapy
-import time
 import os
 from dotenv import load_dotenv
 from job_board_scraper.spiders.greenhouse_jobs_outline_spider import (
     GreenhouseJobsOutlineSpider,
+    compile_xpaths,
 )
-from job_board_scraper.items import LeverJobsOutlineItem
+from job_board_scraper.items import LeverJobsOutlineItem, get_first_word
 from job_board_scraper.utils import general as util
-from scrapy.loader import ItemLoader
-from scrapy.selector import Selector
-from scrapy.utils.project import get_project_settings
-from datetime import datetime
 
 load_dotenv()
 
@@ -19,25 +15,36 @@ class LeverJobsOutlineSpider(GreenhouseJobsOutlineSpider):
     name = "lever_jobs_outline"
     allowed_domains = ["jobs.lever.co"]
 
+    # The opening is the posting-title link itself
+    opening_xpaths = compile_xpaths({
+        "opening_link": "@href",
+        "opening_title": ".//h5/text()",
+        "workplace_type": ".//span[contains(@class, 'workplaceType')]/text()",
+        "location": ".//span[contains(@class, 'location')]/text()",
+    })
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.spider_id = kwargs.pop("spider_id", 3)
         self.logger.info(f"Initialized Spider, {self.html_source}")
 
+    def get_callback(self):
+        # Lever has a single page layout
+        return self.parse
+
     def parse(self, response):
         response_html = self.finalize_response(response)
-        selector = Selector(text=response_html, type="html")
+        selector = util.html_selector(response_html)
         postings_groups = selector.xpath('//div[@class="postings-group"]')
+        rows = 0
 
         for i, postings_group in enumerate(postings_groups):
-            stratified_selector = Selector(text=postings_group.get(), type="html")
-
-            potential_primary_department = stratified_selector.xpath(
-                f"//div[contains(@class, 'large-category-header')]/text()"
+            potential_primary_department = postings_group.xpath(
+                ".//div[contains(@class, 'large-category-header')]/text()"
             )
 
-            label_department = stratified_selector.xpath(
-                f"//div[contains(@class, 'large-category-label')]/text()"
+            label_department = postings_group.xpath(
+                ".//div[contains(@class, 'large-category-label')]/text()"
             )
 
             if i == 0:
@@ -54,28 +61,21 @@ class LeverJobsOutlineSpider(GreenhouseJobsOutlineSpider):
             else:
                 departments = label_department.get()
 
-            job_openings = stratified_selector.xpath("//a[@class='posting-title']")
+            job_openings = postings_group.xpath(".//a[@class='posting-title']")
 
             for j, opening in enumerate(job_openings):
-                il = ItemLoader(
-                    item=LeverJobsOutlineItem(),
-                    selector=Selector(text=opening.get(), type="html"),
-                )
-                self.logger.info(f"Parsing row {i+1}, {self.company_name} {self.name}")
+                self.logger.debug("Parsing row %s, %s, %s", i + 1, self.company_name, self.name)
+                rows += 1
 
-                il.add_value("department_names", departments)
-                il.add_xpath("opening_link", '//a[@class="posting-title"]/@href')
-                il.add_xpath("opening_title", "//h5/text()")
-                il.add_xpath(
-                    "workplace_type", "//span[contains(@class, 'workplaceType')]/text()"
-                )
-                il.add_xpath("location", "//span[contains(@class, 'location')]/text()")
-
-                il.add_value("id", self.determine_row_id(i * 1000 + j))
-                il.add_value("created_at", self.created_at)
-                il.add_value("updated_at", self.updated_at)
-                il.add_value("source", self.html_source)
-                il.add_value("company_name", self.company_name)
-                il.add_value("run_hash", self.run_hash)
+                fields = self.extract_xpaths(opening, self.opening_xpaths)
+                if fields["workplace_type"] is not None:
+                    fields["workplace_type"] = get_first_word(fields["workplace_type"])
 
-                yield il.load_item()
+                yield self.make_item(
+                    LeverJobsOutlineItem,
+                    self.determine_row_id(i * 1000 + j),
+                    department_names=departments,
+                    company_name=self.company_name,
+                    **fields,
+                )
+        self.log_rows_parsed(rows)
@@ -1,9 +1,41 @@
 from hashids import Hashids
+import functools
 import os
+from datetime import datetime, timezone
 from dotenv import load_dotenv
+from lxml import etree
+from scrapy.selector import Selector
 
 load_dotenv()
 
+# One parser for every page in the process; no_network stops it fetching DTDs or entities
+html_parser = etree.HTMLParser(
+    recover=True, no_network=True, encoding="utf-8", remove_blank_text=True
+)
+
 hash_ids = Hashids(
     salt=os.environ.get("HASHIDS_SALT"), alphabet="abcdefghijklmnopqrstuvwxyz1234567890"
 )
+
+
+def hash_encode(*numbers):
+    return hash_ids.encode(*numbers)
+
+
+@functools.lru_cache(maxsize=8)
+def _utc_date_for_day(day):
+    return datetime.fromtimestamp(day * 86400, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def utc_date(timestamp):
+    """%Y-%m-%d date in UTC, formatted once per day rather than per call"""
+    return _utc_date_for_day(int(timestamp) // 86400)
+
+
+def html_selector(html):
+    """Parse a page with the shared HTML parser and wrap it in a Selector"""
+    root = etree.fromstring(html.encode("utf-8"), html_parser)
+    if root is None:
+        # Blank pages have no root element to wrap
+        return Selector(text="<html/>", type="html")
+    return Selector(root=root, type="html")
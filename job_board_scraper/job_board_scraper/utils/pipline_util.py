@@ -12,6 +12,13 @@ def set_initial_table_schema(spider_name):
     """
 
 
+def create_recency_index(table_name):
+    ## The runner's scrape TTL looks up recent sources by updated_at, so index it on these append-only tables
+    return f"""; CREATE INDEX IF NOT EXISTS {table_name}_updated_at_source_idx
+        ON {table_name} (updated_at, source)
+    """
+
+
 def create_table_schema(table_name, initial_table_schema=""):
     if table_name == "greenhouse_job_departments":
         return (
@@ -33,6 +40,7 @@ def create_table_schema(table_name, initial_table_schema=""):
             , opening_title text
         )
         """
+            + create_recency_index(table_name)
         )
     elif table_name == "lever_jobs_outline":
         return (
@@ -45,6 +53,7 @@ def create_table_schema(table_name, initial_table_schema=""):
             , workplace_type text
         )
         """
+            + create_recency_index(table_name)
         )
     else:
         return initial_table_schema
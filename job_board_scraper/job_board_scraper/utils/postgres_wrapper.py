@@ -1,5 +1,79 @@
+import atexit
 import os
+import threading
 import psycopg2
+from contextlib import contextmanager
+from psycopg2.pool import ThreadedConnectionPool
+
+# Connections open lazily up to the cap; every process builds its own pool, so keep few idle.
+# Threads beyond the cap wait for a free connection rather than opening another backend
+POOL_MIN_CONNECTIONS = 2
+POOL_MAX_CONNECTIONS = 10
+
+_pool = None
+_pool_pid = None
+_pool_slots = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    ## Process-wide connection pool, created on first use in each process;
+    ## a forked worker must not share the sockets of a pool it inherited
+    global _pool, _pool_pid, _pool_slots
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool_pid = os.getpid()
+            # getconn raises PoolError once maxconn are out, so get_conn waits on a slot first
+            _pool_slots = threading.BoundedSemaphore(POOL_MAX_CONNECTIONS)
+            _pool = ThreadedConnectionPool(
+                minconn=POOL_MIN_CONNECTIONS,
+                maxconn=POOL_MAX_CONNECTIONS,
+                host=os.environ.get("PG_HOST"),
+                user=os.environ.get("PG_USER"),
+                password=os.environ.get("PG_PASSWORD"),
+                dbname=os.environ.get("PG_DATABASE"),
+            )
+            atexit.register(_pool.closeall)
+    return _pool
+
+
+def close_pool():
+    ## Close this process's connections, e.g. before forking workers that build their own pools
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.closeall()
+        _pool = None
+
+
+def getconn():
+    ## Check a connection out, blocking until one is free rather than failing when the pool is exhausted;
+    ## every checkout must be handed back with putconn()
+    pool = get_pool()
+    _pool_slots.acquire()
+    try:
+        return pool.getconn()
+    except Exception:
+        _pool_slots.release()
+        raise
+
+
+def putconn(connection):
+    ## Hand a connection from getconn() back, freeing its slot
+    try:
+        get_pool().putconn(connection)
+    finally:
+        _pool_slots.release()
+
+
+@contextmanager
+def get_conn():
+    ## Borrow a pooled connection for the duration of a with-block
+    connection = getconn()
+    try:
+        yield connection
+    finally:
+        putconn(connection)
 
 
 class PostgresWrapper:
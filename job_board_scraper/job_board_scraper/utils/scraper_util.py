@@ -1,34 +1,89 @@
+import itertools
+import logging
+import multiprocessing
+import os
+
+logger = logging.getLogger("logger")
+
+
+def available_cpus():
+    """
+    CPUs this process may actually run on. In containers the affinity mask is often
+    narrower than cpu_count(), which reports every core on the host.
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        # sched_getaffinity is Linux-only
+        return os.cpu_count() or 1
+
+
 def get_url_chunks(careers_page_urls, chunk_size):
     """
-    Split a list of URLs into chunks for parallel processing.
-    Makes sure to return at least one chunk even if the input is empty.
+    Split URLs into chunks for parallel processing, lazily, as the pool asks for them.
+    Yields nothing if the input is empty.
     
     Args:
-        careers_page_urls: List of tuples containing URLs
+        careers_page_urls: Iterable of tuples containing URLs
         chunk_size: Number of URLs per chunk
         
-    Returns:
-        List of lists, each containing URLs as strings
+    Yields:
+        Lists of URLs as strings; any remaining URLs form a shorter final chunk
     """
-    # Handle empty input
-    if not careers_page_urls:
-        return []
-    
     # Ensure chunk_size is at least 1
     chunk_size = max(1, chunk_size)
     
-    url_chunks = []
-    single_chunk = []
+    urls = (url[0] for url in careers_page_urls)  # UnTuple-ify
     
-    for i, url in enumerate(careers_page_urls):
-        careers_page_url = url[0]  # UnTuple-ify
-        single_chunk.append(careers_page_url)
-        if i % chunk_size == chunk_size - 1:
-            url_chunks.append(single_chunk)
-            single_chunk = []
+    while True:
+        chunk = list(itertools.islice(urls, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _run_numbered_chunk(task):
+    """
+    Unpack one (run_chunk, url_chunk, chunk_number) task, as imap has no star variant.
+    Returns (chunk_number, succeeded); failures are logged here so they never reach the
+    parent, where re-raising would tear down the pool and every chunk still running.
+    """
+    run_chunk, url_chunk, chunk_number = task
+    try:
+        run_chunk(url_chunk, chunk_number)
+    except Exception:
+        logger.exception("Chunk %d failed", chunk_number)
+        return chunk_number, False
+    return chunk_number, True
+
+
+def run_chunks(run_chunk, url_chunks, chunk_count, max_workers=None):
+    """
+    Run run_chunk(chunk, chunk_number) for every chunk across worker processes.
+    Each worker handles a single chunk and exits, because a Scrapy CrawlerProcess
+    cannot restart the Twisted reactor in a process that has already run one.
     
-    # Add any remaining URLs as a final chunk
-    if len(single_chunk) > 0:
-        url_chunks.append(single_chunk)
-        
-    return url_chunks
+    Args:
+        run_chunk: Picklable function taking (url_chunk, chunk_number)
+        url_chunks: Iterable of URL lists, as yielded by get_url_chunks
+        chunk_count: Number of chunks url_chunks yields, which sizes the pool
+        max_workers: Process cap, never more than the CPUs available to this process
+    """
+    # Nothing to crawl, so don't pay for starting worker processes
+    if not chunk_count:
+        logger.warning("No URL chunks to run")
+        return
+    cpus = available_cpus()
+    processes = max(1, min(chunk_count, max_workers or cpus, cpus))
+    tasks = ((run_chunk, chunk, i) for i, chunk in enumerate(url_chunks))
+    with multiprocessing.Pool(processes=processes, maxtasksperchild=1) as pool:
+        # chunksize=1 hands chunks out one at a time, so workers that finish early pick up the next.
+        # imap_unordered reports each chunk as it finishes rather than blocking until all do
+        failed = 0
+        results = pool.imap_unordered(_run_numbered_chunk, tasks, chunksize=1)
+        for finished, (chunk_number, succeeded) in enumerate(results, 1):
+            failed += not succeeded
+            logger.info("Finished %d/%d chunks (chunk %d %s)", finished, chunk_count,
+                        chunk_number, "succeeded" if succeeded else "failed")
+    if failed:
+        logger.warning("%d of %d chunks failed", failed, chunk_count)
@@ -1,11 +1,15 @@
 import sys
-import scrapy
+import aiohttp
+import asyncio
+import functools
+import itertools
+import math
 import os
 import logging
-import psycopg2
+from psycopg2.extras import execute_values
 import time
-import multiprocessing
 import requests
+from collections import defaultdict
 from scrapy.crawler import CrawlerProcess
 from job_board_scraper.spiders.greenhouse_jobs_outline_spider import (
     GreenhouseJobsOutlineSpider,
@@ -13,11 +17,14 @@ from job_board_scraper.spiders.greenhouse_jobs_outline_spider import (
 from job_board_scraper.spiders.greenhouse_job_departments_spider import (
     GreenhouseJobDepartmentsSpider,
 )
-from job_board_scraper.utils.postgres_wrapper import PostgresWrapper
+from job_board_scraper.utils import postgres_wrapper
 from job_board_scraper.utils import general as util
-from job_board_scraper.utils.scraper_util import get_url_chunks
+from job_board_scraper.utils.scraper_util import get_url_chunks, run_chunks
 from scrapy.utils.project import get_project_settings
-from urllib.parse import urlparse
+from twisted.internet import defer
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlsplit
 
 # Configure logging
 logging.basicConfig(
@@ -25,7 +32,36 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger("logger")
-run_hash = util.hash_ids.encode(int(time.time()))
+# Crawlers (one per spider per URL) allowed to run at once inside a CrawlerProcess.
+# Boards share hosts, so this times CONCURRENT_REQUESTS_PER_DOMAIN (4) is the ceiling
+# on requests to one host such as boards.greenhouse.io: 32 with the default of 8
+MAX_CONCURRENT_CRAWLS = int(os.environ.get("MAX_CONCURRENT_CRAWLS", 8))
+# URL checks in flight at once during verification, overall and against any one host
+VERIFY_CONCURRENCY = 20
+VERIFY_CONCURRENCY_PER_HOST = 4
+# URLs pulled from the query cursor and checked per batch, so the full set never sits in memory
+VERIFY_BATCH_SIZE = 500
+HEAD_TIMEOUT = aiohttp.ClientTimeout(total=10)
+GET_TIMEOUT = aiohttp.ClientTimeout(total=15)
+# Spelled out so both HTTP clients ask for the same compressed, kept-alive responses;
+# br is left out as neither client can decode it without the brotli package
+VERIFY_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,*/*;q=0.1',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+# Statuses servers answer HEAD with when they only refuse the method, not the page
+HEAD_REFUSED_STATUSES = frozenset((403, 405, 501))
+# The GET fallback asks for a single byte, so servers that honour it send no page body (206)
+GET_FALLBACK_HEADERS = {"Range": "bytes=0-0"}
+# Shared by the synchronous checks so repeat hosts reuse kept-alive connections
+verify_session = requests.Session()
+verify_session.headers.update(VERIFY_HEADERS)
+verify_session.mount(
+    "https://",
+    HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.3)),
+)
 
 # Conditionally import LeverJobsOutlineSpider
 try:
@@ -35,6 +71,28 @@ except ImportError:
     logger.warning("LeverJobsOutlineSpider not available - skipping Lever job boards")
     LEVER_AVAILABLE = False
 
+# Classifying the board in SQL spares the per-URL host parsing at dispatch
+DEFAULT_PAGES_TO_SCRAPE_QUERY = """
+select distinct url,
+    case
+        when url like '%greenhouse.io/%' then 'greenhouse'
+        when url like '%lever.co/%' then 'lever'
+    end as board
+from company_urls
+where is_enabled=true
+    and (url like '%greenhouse.io/%' or url like '%lever.co/%');
+"""
+
+# Tables whose rows record when each careers page was last scraped
+SCRAPED_TABLES = ("greenhouse_jobs_outline", "lever_jobs_outline")
+
+# Boards are matched on their domain under any subdomain: boards.eu.greenhouse.io, jobs.lever.co
+BOARD_DOMAINS = (("greenhouse.io", "greenhouse"), ("lever.co", "lever"))
+SPIDERS_BY_BOARD = {
+    "greenhouse": (GreenhouseJobDepartmentsSpider, GreenhouseJobsOutlineSpider),
+    "lever": (LeverJobsOutlineSpider,) if LEVER_AVAILABLE else (),
+}
+
 
 class DatabaseManager:
     """A simple database connection manager to reuse connections"""
@@ -43,14 +101,12 @@ class DatabaseManager:
         self.connection = None
     
     def get_connection(self):
-        """Get an existing connection or create a new one"""
-        if self.connection is None or self.connection.closed:
-            self.connection = psycopg2.connect(
-                host=os.environ.get("PG_HOST"),
-                user=os.environ.get("PG_USER"),
-                password=os.environ.get("PG_PASSWORD"),
-                dbname=os.environ.get("PG_DATABASE"),
-            )
+        """Borrow a connection from the process-wide pool, keeping it until close()"""
+        if self.connection is not None and self.connection.closed:
+            # Hand the dead connection back so its pool slot is freed
+            self.close()
+        if self.connection is None:
+            self.connection = postgres_wrapper.getconn()
         return self.connection
     
     def execute_query(self, query, params=None, fetch=True):
@@ -75,131 +131,203 @@ class DatabaseManager:
         finally:
             cursor.close()
     
+    def iter_query(self, query, params=None, itersize=1000):
+        """
+        Stream rows from a server-side cursor, itersize rows per round-trip.
+        Uses its own pooled connection so commits on the main one don't close the cursor.
+        """
+        with postgres_wrapper.get_conn() as conn:
+            with conn, conn.cursor(name="iter_query") as cursor:
+                cursor.itersize = itersize
+                cursor.execute(query, params)
+                yield from cursor
+    
     def close(self):
-        """Close the connection"""
-        if self.connection and not self.connection.closed:
-            self.connection.close()
+        """Return the connection to the pool"""
+        if self.connection is not None:
+            # The pool discards connections that were closed underneath it
+            postgres_wrapper.putconn(self.connection)
             self.connection = None
 
 
+async def check_url(session, host_semaphore, semaphore, url):
+    """
+    Status of a URL as (request_type, status_code), trying HEAD and falling back to GET.
+    Raises the aiohttp or timeout error when neither request gets a response.
+    """
+    # Wait on the host first, so checks queued behind a busy host don't hold global slots
+    async with host_semaphore, semaphore:
+        # First try a HEAD request (faster)
+        try:
+            async with session.head(url, allow_redirects=True, timeout=HEAD_TIMEOUT) as response:
+                if response.status not in HEAD_REFUSED_STATUSES:
+                    return "HEAD", response.status
+            logger.info("HEAD refused for %s (Status: %s), trying GET...", url, response.status)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # If HEAD fails, try GET as fallback (more compatible)
+            logger.info("HEAD request failed for %s, trying GET...", url)
+        # Leaving the block releases the connection without downloading the body
+        async with session.get(
+            url, headers=GET_FALLBACK_HEADERS, allow_redirects=True, timeout=GET_TIMEOUT
+        ) as response:
+            return "GET", response.status
+
+
+async def check_url_batches(url_tuples, handle_batch):
+    """
+    Check URL rows VERIFY_BATCH_SIZE at a time over one session, calling handle_batch(batch, results)
+    after each; results line up with the batch, exceptions included
+    """
+    # Created inside the loop, as Python 3.9 binds a semaphore to the loop current at creation
+    semaphore = asyncio.Semaphore(VERIFY_CONCURRENCY)
+    # The per-host limit keeps a board's servers from seeing a burst, in place of a sleep between URLs
+    host_semaphores = defaultdict(lambda: asyncio.Semaphore(VERIFY_CONCURRENCY_PER_HOST))
+    connector = aiohttp.TCPConnector(limit=50, limit_per_host=VERIFY_CONCURRENCY_PER_HOST)
+    async with aiohttp.ClientSession(connector=connector, headers=VERIFY_HEADERS) as session:
+        while True:
+            batch = list(itertools.islice(url_tuples, VERIFY_BATCH_SIZE))
+            if not batch:
+                return
+            results = await asyncio.gather(
+                *(
+                    check_url(session, host_semaphores[urlsplit(url).netloc], semaphore, url)
+                    for url, *_ in batch
+                ),
+                return_exceptions=True,
+            )
+            handle_batch(batch, results)
+
+
 def verify_urls(urls_to_verify, db_connection=None):
     """
-    Verify URLs before crawling them.
+    Verify URLs before crawling them, checking them concurrently.
     Returns a tuple of (valid_urls, invalid_urls)
     """
-    import time
-    
     valid_urls = []
     invalid_urls = []
     
-    logger.info(f"Verifying {len(urls_to_verify)} URLs...")
+    logger.info("Verifying URLs...")
     
-    # Create a connection if not provided
-    connection_created = False
-    if db_connection is None:
-        db_connection = psycopg2.connect(
-            host=os.environ.get("PG_HOST"),
-            user=os.environ.get("PG_USER"),
-            password=os.environ.get("PG_PASSWORD"),
-            dbname=os.environ.get("PG_DATABASE"),
-        )
-        connection_created = True
-    
-    for url_tuple in urls_to_verify:
-        url = url_tuple[0]  # Extract the URL from the tuple
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            # First try a HEAD request (faster)
-            try:
-                head_response = requests.head(url, headers=headers, timeout=10, allow_redirects=True)
-                response = head_response
-                request_type = "HEAD"
-            except requests.exceptions.RequestException:
-                # If HEAD fails, try GET as fallback (more compatible)
-                logger.info(f"HEAD request failed for {url}, trying GET...")
-                get_response = requests.get(url, headers=headers, timeout=15, allow_redirects=True, stream=True)
-                # Close the connection to avoid downloading the entire content
-                get_response.close()
-                response = get_response
-                request_type = "GET"
+    def record_batch(batch, results):
+        for url_tuple, result in zip(batch, results):
+            url = url_tuple[0]  # Extract the URL from the tuple
+            if isinstance(result, Exception):
+                invalid_urls.append((url, str(result)))
+                logger.warning(f"Error verifying URL: {url} - {result!r}")
+                continue
             
+            request_type, status_code = result
             # If we get a 2xx or 3xx status code, consider the URL valid
-            if 200 <= response.status_code < 400:
+            if 200 <= status_code < 400:
                 valid_urls.append(url_tuple)
-                logger.info(f"URL verified ({request_type}): {url} (Status: {response.status_code})")
+                logger.info("URL verified (%s): %s (Status: %s)", request_type, url, status_code)
             else:
-                invalid_urls.append((url, response.status_code))
-                logger.warning(f"Invalid URL ({request_type}): {url} (Status: {response.status_code})")
-                
-                # Mark as disabled in the database
-                cursor = db_connection.cursor()
-                cursor.execute(
-                    "UPDATE company_urls SET is_enabled=false, updated_at=CURRENT_TIMESTAMP WHERE url=%s;",
-                    (url,)
-                )
-                db_connection.commit()
-                cursor.close()
-                
-        except requests.exceptions.RequestException as e:
-            invalid_urls.append((url, str(e)))
-            logger.warning(f"Error verifying URL: {url} - {str(e)}")
-            
-            # Mark as disabled in the database
-            try:
-                cursor = db_connection.cursor()
-                cursor.execute(
-                    "UPDATE company_urls SET is_enabled=false, updated_at=CURRENT_TIMESTAMP WHERE url=%s;",
-                    (url,)
-                )
-                db_connection.commit()
-                cursor.close()
-            except Exception as db_error:
-                logger.error(f"Database error: {str(db_error)}")
-        
-        # Add a small delay to prevent overloading servers
-        time.sleep(0.5)
+                invalid_urls.append((url, status_code))
+                logger.warning("Invalid URL (%s): %s (Status: %s)", request_type, url, status_code)
+    
+    # A private loop rather than asyncio.run, which would leave the main thread without the
+    # current event loop that Scrapy's asyncio reactor picks up later in this process.
+    # Rows are pulled from the query cursor a batch at a time rather than all at once
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(check_url_batches(iter(urls_to_verify), record_batch))
+    finally:
+        loop.close()
     
-    # Close the connection if we created it
-    if connection_created:
-        db_connection.close()
+    if invalid_urls:
+        disable_urls([url for url, _ in invalid_urls], db_connection)
     
     return valid_urls, invalid_urls
 
 
-def run_spider(single_url_chunk, chunk_number):
-    """Run spiders for a chunk of URLs"""
+def disable_urls(urls, db_connection=None):
+    """Mark URLs as disabled in the database with a single UPDATE"""
+    # Borrow a connection if not provided
+    connection_created = False
+    if db_connection is None:
+        db_connection = postgres_wrapper.getconn()
+        connection_created = True
+    
+    try:
+        with db_connection, db_connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE company_urls SET is_enabled=false, updated_at=CURRENT_TIMESTAMP WHERE url = ANY(%s);",
+                (urls,)
+            )
+        logger.info("Disabled %d URLs that failed verification", len(urls))
+    except Exception as db_error:
+        logger.error(f"Database error: {str(db_error)}")
+    finally:
+        # Return the connection if we borrowed it
+        if connection_created:
+            postgres_wrapper.putconn(db_connection)
+
+
+@functools.lru_cache(maxsize=1)
+def get_settings():
+    """Project settings, loaded once per process; crawlers take their own copy"""
+    settings = get_project_settings()
+    if os.environ.get("SCRAPER_ENV") == "dev":
+        # Development runs replay cached pages instead of re-downloading boards while spider
+        # logic changes, within the expiry set in settings.py and the spiders' custom_settings
+        settings.set("HTTPCACHE_ENABLED", True, priority="cmdline")
+    return settings
+
+
+def get_spiders_for_url(careers_page_url, board=None):
+    """
+    Spider classes that scrape a careers page, picked by its job board.
+    The board comes pre-classified from the query when it can; the host covers queries that don't.
+    """
+    if board not in SPIDERS_BY_BOARD:
+        board = board_for_url(careers_page_url)
+    return SPIDERS_BY_BOARD.get(board, ())
+
+
+def board_column(url_tuple):
+    """
+    The query's board for a (url, board) row, or None when the second column isn't one,
+    such as the (url, company_name) rows older PAGES_TO_SCRAPE_QUERY values return
+    """
+    if len(url_tuple) > 1 and url_tuple[1] in SPIDERS_BY_BOARD:
+        return url_tuple[1]
+    return None
+
+
+def board_for_url(careers_page_url):
+    """Job board a URL belongs to by its registrable domain, so any subdomain or none matches"""
+    host = urlsplit(careers_page_url).hostname or ""
+    for domain, board in BOARD_DOMAINS:
+        if host == domain or host.endswith("." + domain):
+            return board
+    return None
+
+
+def new_run_hash():
+    """Tag shared by every row written during one run"""
+    return util.hash_encode(int(time.time()))
+
+
+def run_spider(single_url_chunk, chunk_number, run_hash, boards=None):
+    """
+    Run spiders for a chunk of URLs in one CrawlerProcess, given any {url: board} already known.
+    run_hash is passed in rather than read from module state, so spawned workers share the parent's.
+    """
+    boards = boards or {}
     logger.info(f"Processing chunk {chunk_number} with {len(single_url_chunk)} URLs")
-    process = CrawlerProcess(get_project_settings())
+    process = CrawlerProcess(get_settings())
+    # Each crawler has its own downloader and pipeline connection, so cap how many run at once
+    semaphore = defer.DeferredSemaphore(MAX_CONCURRENT_CRAWLS)
+    first_url_id = chunk_number * len(single_url_chunk)
     for i, careers_page_url in enumerate(single_url_chunk):
-        logger.info(f"url = {careers_page_url}")
-        
-        # Use proper URL parsing for more reliable board type detection
-        parsed_url = urlparse(careers_page_url)
-        
-        # Check for Greenhouse job boards
-        if "greenhouse.io" in parsed_url.netloc:
-            process.crawl(
-                GreenhouseJobDepartmentsSpider,
-                careers_page_url=careers_page_url,
-                run_hash=run_hash,
-                url_id=chunk_number * len(single_url_chunk) + i,
-            )
-            process.crawl(
-                GreenhouseJobsOutlineSpider,
+        logger.info("url = %s", careers_page_url)
+        for spider_class in get_spiders_for_url(careers_page_url, boards.get(careers_page_url)):
+            semaphore.run(
+                process.crawl,
+                spider_class,
                 careers_page_url=careers_page_url,
                 run_hash=run_hash,
-                url_id=chunk_number * len(single_url_chunk) + i,
-            )
-        # Check for Lever job boards
-        elif "lever.co" in parsed_url.netloc and LEVER_AVAILABLE:
-            process.crawl(
-                LeverJobsOutlineSpider,
-                careers_page_url=careers_page_url,
-                run_hash=run_hash,
-                url_id=chunk_number * len(single_url_chunk) + i,
+                url_id=first_url_id + i,
             )
     process.start()
 
@@ -209,8 +337,8 @@ def initialize_database():
     # Create a database manager
     db_manager = DatabaseManager()
     
-    # Create the company URLs table if it doesn't exist
-    # Adding a UNIQUE constraint to the url column
+    # Create the company URLs table, the unique index on url that backs the ON CONFLICT (url)
+    # upserts and the disable UPDATEs, and the job posting tables in one round trip and one transaction
     db_manager.execute_query("""
     CREATE TABLE IF NOT EXISTS company_urls (
         id SERIAL PRIMARY KEY,
@@ -220,31 +348,11 @@ def initialize_database():
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     );
-    """, fetch=False)
     
-    # Check if the table exists and has the UNIQUE constraint
-    try:
-        # Try to add UNIQUE constraint to the url column if it doesn't already exist
-        db_manager.execute_query("""
-        DO $$
-        BEGIN
-            -- Check if constraint exists
-            IF NOT EXISTS (
-                SELECT 1 
-                FROM pg_constraint 
-                WHERE conname = 'company_urls_url_key'
-            ) THEN
-                -- Add unique constraint if it doesn't exist
-                ALTER TABLE company_urls ADD CONSTRAINT company_urls_url_key UNIQUE (url);
-            END IF;
-        END $$;
-        """, fetch=False)
-        logger.info("Ensured UNIQUE constraint on url column")
-    except Exception as e:
-        logger.error(f"Error ensuring UNIQUE constraint: {str(e)}")
+    CREATE UNIQUE INDEX IF NOT EXISTS company_urls_url_key ON company_urls(url);
+    -- Covers the enabled-URL driver query without touching disabled rows
+    CREATE INDEX IF NOT EXISTS company_urls_enabled_url_idx ON company_urls(url) WHERE is_enabled;
     
-    # Create job posting tables if they don't exist
-    db_manager.execute_query("""
     CREATE TABLE IF NOT EXISTS greenhouse_job_departments (
         id VARCHAR(255) PRIMARY KEY,
         department_id VARCHAR(255),
@@ -269,6 +377,10 @@ def initialize_database():
         source VARCHAR(255),
         run_hash VARCHAR(255)
     );
+    
+    -- Backs the scrape TTL's recent-source lookup; the pipelines add the same index on their tables
+    CREATE INDEX IF NOT EXISTS greenhouse_jobs_outline_updated_at_source_idx
+        ON greenhouse_jobs_outline (updated_at, source);
     """, fetch=False)
     
     # Check if we have any company URLs
@@ -286,24 +398,32 @@ def initialize_database():
             ("https://boards.greenhouse.io/stripe", "Stripe")
         ]
         
-        for url, company_name in default_urls:
-            try:
-                # Verify URL before adding
-                valid = verify_url_before_adding(url)
-                
-                # Simpler insert without ON CONFLICT to avoid issues
-                db_manager.execute_query(
-                    "INSERT INTO company_urls (url, company_name, is_enabled) VALUES (%s, %s, %s);",
-                    (url, company_name, valid),
-                    fetch=False
-                )
-                logger.info(f"Added URL {url} with is_enabled={valid}")
-            except psycopg2.errors.UniqueViolation:
-                logger.info(f"URL {url} already exists, skipping")
-            except Exception as e:
-                logger.error(f"Error inserting URL {url}: {str(e)}")
+        # Verify URLs before adding
+        rows = [
+            (url, company_name, verify_url_before_adding(url))
+            for url, company_name in default_urls
+        ]
         
-        logger.info(f"Added default company URLs.")
+        # One statement and one commit; the unique url index absorbs duplicates
+        conn = db_manager.get_connection()
+        try:
+            with conn, conn.cursor() as cursor:
+                inserted = {
+                    row[0] for row in execute_values(
+                        cursor,
+                        "INSERT INTO company_urls (url, company_name, is_enabled) VALUES %s ON CONFLICT (url) DO NOTHING RETURNING url;",
+                        rows,
+                        fetch=True,
+                    )
+                }
+            for url, _, valid in rows:
+                if url in inserted:
+                    logger.info("Added URL %s with is_enabled=%s", url, valid)
+                else:
+                    logger.info("URL %s already exists, skipping", url)
+            logger.info("Added default company URLs.")
+        except Exception as e:
+            logger.error(f"Error inserting default URLs: {str(e)}")
     
     # Close the database connection
     db_manager.close()
@@ -312,19 +432,21 @@ def initialize_database():
 def verify_url_before_adding(url):
     """Verify a single URL before adding it to the database"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
         # Try HEAD first
         try:
-            head_response = requests.head(url, headers=headers, timeout=10, allow_redirects=True)
-            response = head_response
+            response = verify_session.head(url, timeout=10, allow_redirects=True)
         except requests.exceptions.RequestException:
-            # Fallback to GET
-            get_response = requests.get(url, headers=headers, timeout=15, allow_redirects=True, stream=True)
-            get_response.close()  # Close to avoid downloading everything
-            response = get_response
+            response = None
+        
+        if response is None or response.status_code in HEAD_REFUSED_STATUSES:
+            # Fallback to GET; the with-block closes the response on every path, errors included
+            with verify_session.get(
+                url, headers=GET_FALLBACK_HEADERS, timeout=15, allow_redirects=True, stream=True
+            ) as response:
+                # Draining the single ranged byte lets the socket go back to the pool for reuse
+                if response.status_code == 206:
+                    for _ in response.iter_content(1):
+                        pass
         
         return 200 <= response.status_code < 400
         
@@ -332,107 +454,137 @@ def verify_url_before_adding(url):
         return False
 
 
-def execute_query(query):
-    """Execute a query and return the results"""
-    # Create a database manager
-    db_manager = DatabaseManager()
+def canonical_url(url):
+    """Case-insensitive host, no trailing slash and no scheme, so near-duplicate rows compare equal"""
+    parts = urlsplit(url.strip())
+    return (parts.netloc.lower(), parts.path.rstrip("/"), parts.query)
+
+
+def dedupe_urls(urls):
+    """Yield each URL row once, keeping the first spelling seen so database updates still match it"""
+    seen = set()
+    for url_tuple in urls:
+        key = canonical_url(url_tuple[0])
+        if key not in seen:
+            seen.add(key)
+            yield url_tuple
+
+
+def filter_supported(urls):
+    """Drop URLs no spider can scrape before they cost a verification request"""
+    for url_tuple in urls:
+        if get_spiders_for_url(url_tuple[0], board_column(url_tuple)):
+            yield url_tuple
+        else:
+            logger.debug("No spider for %s, skipping", url_tuple[0])
+
+
+def filter_recently_scraped(db_manager, urls, ttl_seconds):
+    """
+    Drop URLs whose job outline rows were written within the last ttl_seconds.
+    Works on the result of any PAGES_TO_SCRAPE_QUERY, so custom queries get the same skip.
+    """
+    # Outline tables are created by the pipelines on first use, so only query those that exist
+    existing_tables = db_manager.execute_query(
+        "SELECT table_name FROM information_schema.tables WHERE table_name = ANY(%s);",
+        (list(SCRAPED_TABLES),),
+    )
+    if not existing_tables:
+        return urls
     
-    try:
-        # Execute the query
-        results = db_manager.execute_query(query)
-        return results
-    finally:
-        # Close the connection
-        db_manager.close()
+    cutoff = int(time.time()) - ttl_seconds
+    recent_query = " UNION ".join(
+        f"SELECT source FROM {table_name} WHERE updated_at >= %(cutoff)s"
+        for (table_name,) in existing_tables
+    )
+    recent_sources = {row[0] for row in db_manager.execute_query(recent_query, {"cutoff": cutoff})}
+    
+    # Spiders record the URL without its trailing slash as the row source
+    return (url_tuple for url_tuple in urls if url_tuple[0].rstrip("/") not in recent_sources)
 
 
 def run_single_spider(url):
     """Run a single spider without multiprocessing"""
     logger.info(f"Running single spider for URL: {url}")
-    process = CrawlerProcess(get_project_settings())
-    
-    # Use proper URL parsing for more reliable board type detection
-    parsed_url = urlparse(url)
-    
-    # Check for Greenhouse job boards
-    if "greenhouse.io" in parsed_url.netloc:
-        process.crawl(
-            GreenhouseJobDepartmentsSpider,
-            careers_page_url=url,
-            run_hash=run_hash,
-            url_id=0,
-        )
-        process.crawl(
-            GreenhouseJobsOutlineSpider,
-            careers_page_url=url,
-            run_hash=run_hash,
-            url_id=0,
-        )
-    # Check for Lever job boards
-    elif "lever.co" in parsed_url.netloc and LEVER_AVAILABLE:
-        process.crawl(
-            LeverJobsOutlineSpider,
-            careers_page_url=url,
-            run_hash=run_hash,
-            url_id=0,
-        )
-    process.start()
+    run_spider([url], 0, new_run_hash())
 
 
 if __name__ == "__main__":
+    # A careers page URL on the command line scrapes just that board, without reading company_urls
+    if len(sys.argv) > 1:
+        run_single_spider(sys.argv[1])
+        sys.exit(0)
+    
     # Initialize the database tables
     initialize_database()
     
     # Create a database manager for this session
     db_manager = DatabaseManager()
+    run_hash = new_run_hash()
     
     chunk_size = int(os.environ.get("CHUNK_SIZE", 1))
+    scraper_processes = int(os.environ.get("SCRAPER_PROCESSES", 1))
+    # Set to 0 to scrape every URL regardless of when it was last scraped
+    scrape_ttl_seconds = int(os.environ.get("SCRAPE_TTL_SECONDS", 12 * 60 * 60))
     try:
         # Get the query to retrieve URLs to scrape
         query_string = os.environ.get(
             "PAGES_TO_SCRAPE_QUERY", 
-            "select distinct url from company_urls where is_enabled=true;"
+            DEFAULT_PAGES_TO_SCRAPE_QUERY,
         )
         
-        # Execute the query using the connection manager
-        urls_to_scrape = db_manager.execute_query(query_string)
-        logger.info(f"Found {len(urls_to_scrape)} URLs to scrape")
+        # Stream the URLs from a server-side cursor rather than holding every row at once.
+        # DISTINCT in SQL misses spellings like a trailing slash, so dedupe again here
+        urls_to_scrape = dedupe_urls(db_manager.iter_query(query_string))
+        # The default query already filters by board; custom ones may not
+        urls_to_scrape = filter_supported(urls_to_scrape)
         
-        if not urls_to_scrape:
-            logger.warning("No URLs found to scrape. Please add URLs to the company_urls table.")
-            db_manager.close()
-            sys.exit(0)
+        # Skip boards scraped recently enough that a new crawl would find nothing new
+        if scrape_ttl_seconds > 0:
+            urls_to_scrape = filter_recently_scraped(db_manager, urls_to_scrape, scrape_ttl_seconds)
         
         # Verify URLs before processing, reusing the connection
         valid_urls, invalid_urls = verify_urls(urls_to_scrape, db_manager.get_connection())
         
         logger.info(f"Valid URLs: {len(valid_urls)}, Invalid URLs: {len(invalid_urls)}")
         
+        if not valid_urls and not invalid_urls:
+            logger.warning(
+                "No URLs found to scrape. Please add URLs to the company_urls table, "
+                "or lower SCRAPE_TTL_SECONDS to re-scrape recent ones."
+            )
+            db_manager.close()
+            sys.exit(0)
+        
         if not valid_urls:
             logger.warning("No valid URLs found to scrape after verification.")
             db_manager.close()
             sys.exit(0)
         
-        chunks = get_url_chunks(valid_urls, chunk_size)
-        logger.info(f"Split URLs into {len(chunks)} chunks of size {chunk_size}")
-        
-        # Close the connection before starting multiprocessing
+        # Close the connection before starting the crawl
         db_manager.close()
         
-        if len(chunks) > 0:
-            # Use multiprocessing if we have multiple chunks
-            if len(chunks) == 1:
-                # If we only have one chunk, just run it directly without multiprocessing
-                run_spider(chunks[0], 0)
-            else:
-                # Create a list of arguments for starmap
-                args = [(chunk, i) for i, chunk in enumerate(chunks)]
-                
-                # Use multiprocessing to process chunks in parallel
-                with multiprocessing.Pool(processes=min(len(chunks), multiprocessing.cpu_count())) as pool:
-                    pool.starmap(run_spider, args)
+        # Queries that classify rows in SQL return (url, board); other rows fall back to the host
+        boards = {url_tuple[0]: board_column(url_tuple) for url_tuple in valid_urls}
+        
+        if scraper_processes > 1:
+            # Opt-in: split the URLs across worker processes, one reactor each.
+            # Chunks are at least large enough to give each worker a single chunk,
+            # so no process pays Scrapy's start-up cost for just a few URLs
+            chunk_size = max(chunk_size, math.ceil(len(valid_urls) / scraper_processes))
+            chunk_count = math.ceil(len(valid_urls) / chunk_size)
+            logger.info(f"Split URLs into {chunk_count} chunks of size {chunk_size}")
+            # Workers open their own pools; don't leave the parent's connections idle beside them
+            postgres_wrapper.close_pool()
+            run_chunks(
+                functools.partial(run_spider, run_hash=run_hash, boards=boards),
+                get_url_chunks(valid_urls, chunk_size),
+                chunk_count,
+                max_workers=scraper_processes,
+            )
         else:
-            logger.warning("No URL chunks to process.")
+            # One reactor overlaps every board's requests; Scrapy's concurrency settings bound it
+            run_spider([url_tuple[0] for url_tuple in valid_urls], 0, run_hash, boards=boards)
             
     except Exception as e:
         logger.error(f"Error in main process: {str(e)}")